@@ -4,7 +4,12 @@ Contains model parameters, thresholds, and feature weights.
 In production, this would be loaded from environment variables or a config service.
 """
 
-from typing import Dict
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 
 # Model versioning
 MODEL_VERSION = "v1.2.3"
@@ -40,6 +45,29 @@ CONVERSION_THRESHOLDS = {
     "low": 0.0      # < 40% probability
 }
 
+# Tier thresholds as (tier, threshold) pairs, highest threshold first
+LEAD_TIERS_SORTED = tuple(
+    sorted(LEAD_TIER_THRESHOLDS.items(), key=itemgetter(1), reverse=True)
+)
+CHURN_RISK_TIERS_SORTED = tuple(
+    sorted(CHURN_RISK_THRESHOLDS.items(), key=itemgetter(1), reverse=True)
+)
+CONVERSION_TIERS_SORTED = tuple(
+    sorted(CONVERSION_THRESHOLDS.items(), key=itemgetter(1), reverse=True)
+)
+
+
+def tier_for_score(
+    score: float,
+    tiers: Tuple[Tuple[str, float], ...] = LEAD_TIERS_SORTED
+) -> str:
+    """Returns the first tier whose threshold the score meets."""
+    for tier, threshold in tiers:
+        if score >= threshold:
+            return tier
+    return tiers[-1][0]
+
+
 # Model performance metrics (from last evaluation)
 MODEL_PERFORMANCE_METRICS = {
     "accuracy": 0.89,
@@ -61,8 +89,13 @@ FEATURE_IMPORTANCE = {
     "industry_fit": 0.05
 }
 
+# Feature importance as (feature, importance) pairs, most important first
+FEATURE_IMPORTANCE_SORTED = tuple(
+    sorted(FEATURE_IMPORTANCE.items(), key=itemgetter(1), reverse=True)
+)
+
 # Industry fit scoring (based on historical conversion rates)
-INDUSTRY_FIT_SCORES: Dict[str, int] = {
+_INDUSTRY_FIT_SCORES: Dict[str, int] = {
     "technology": 90,
     "saas": 85,
     "data_analytics": 95,
@@ -82,23 +115,47 @@ INDUSTRY_FIT_SCORES: Dict[str, int] = {
     "default": 50  # fallback for unknown industries
 }
 
+# Read-only view with interned keys; scored on every lead
+INDUSTRY_FIT_SCORES: Mapping[str, int] = MappingProxyType(
+    {sys.intern(industry): score for industry, score in _INDUSTRY_FIT_SCORES.items()}
+)
+INDUSTRY_FIT_DEFAULT = INDUSTRY_FIT_SCORES["default"]
+
 # Company size scoring (employee count buckets)
+# Lower bound of each bucket, and the score for each bucket (one below the first bound)
+COMPANY_SIZE_THRESHOLDS = (20, 50, 100, 200, 500, 1000)
+COMPANY_SIZE_SCORES = (30, 50, 60, 70, 80, 90, 100)
+
+
+@lru_cache(maxsize=1024)
+def _company_size_score(employee_count: int) -> int:
+    """Bucket lookup behind get_company_size_score, cached per employee count."""
+    return COMPANY_SIZE_SCORES[bisect_right(COMPANY_SIZE_THRESHOLDS, employee_count)]
+
+
 def get_company_size_score(employee_count: int) -> int:
     """Returns a score based on company size."""
-    if employee_count >= 1000:
-        return 100
-    elif employee_count >= 500:
-        return 90
-    elif employee_count >= 200:
-        return 80
-    elif employee_count >= 100:
-        return 70
-    elif employee_count >= 50:
-        return 60
-    elif employee_count >= 20:
-        return 50
-    else:
-        return 30
+    if not isinstance(employee_count, (int, float)):
+        raise TypeError(
+            f"employee_count must be a number, got {type(employee_count).__name__}"
+        )
+    # Checked before the cache lookup, which would otherwise fail on
+    # unhashable input with a confusing error
+    return _company_size_score(employee_count)
+
+# Prediction log retention (oldest entries are evicted beyond this)
+PREDICTION_LOG_CAPACITY = 100_000
+
+# Maximum number of tool calls accepted in one batch_execute request
+BATCH_MAX_CALLS = 100
+
+# Maximum number of leads accepted in one score_leads_batch request
+BATCH_MAX_LEADS = 1000
+
+# Loop detection: a tool call failing this many times with identical
+# arguments within the window is refused until the window passes
+TOOL_FAILURE_LIMIT = 3
+TOOL_FAILURE_WINDOW_SECONDS = 10
 
 # Drift detection parameters
 DRIFT_WARNING_THRESHOLD = 0.10  # 10% deviation from baseline
@@ -5,11 +5,25 @@ In production, this would interface with databases, data warehouses, or APIs.
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+import secrets
+import time
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Optional, Dict, Any, Deque, List, Tuple
 from datetime import datetime
-import uuid
 
-from mock_data import ACCOUNTS, LEADS, PREDICTION_LOGS
+from config import PREDICTION_LOG_CAPACITY
+from mock_data import (
+    ACCOUNTS,
+    LEADS,
+    ACCOUNTS_BY_ID,
+    LEADS_BY_ID,
+    ACCOUNTS_BY_STATUS,
+    ACCOUNTS_BY_INDUSTRY,
+    ACCOUNTS_BY_INDUSTRY_PLAN,
+    LEADS_BY_INDUSTRY,
+    PREDICTION_LOGS
+)
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +32,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Immutable snapshots handed out by get_all_accounts/get_all_leads
+_ALL_ACCOUNTS: Tuple[Dict[str, Any], ...] = tuple(ACCOUNTS)
+_ALL_LEADS: Tuple[Dict[str, Any], ...] = tuple(LEADS)
+
+# Prediction logs grouped by type, kept in insertion (timestamp) order
+_LOGS_BY_TYPE: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+
+# Prediction logs bucketed by UTC epoch hour for time-window queries
+_LOGS_BY_HOUR: Dict[int, Deque[Dict[str, Any]]] = defaultdict(deque)
+
 
 def get_account(account_id: str) -> Optional[Dict[str, Any]]:
     """
@@ -29,13 +53,13 @@ def get_account(account_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Account data dictionary or None if not found
     """
-    logger.info(f"Fetching account: {account_id}")
-    for account in ACCOUNTS:
-        if account["id"] == account_id:
-            logger.info(f"Account found: {account['company']}")
-            return account
+    logger.info("Fetching account: %s", account_id)
+    account = ACCOUNTS_BY_ID.get(account_id)
+    if account is not None:
+        logger.debug("Account found: %s", account["company"])
+        return account
 
-    logger.warning(f"Account not found: {account_id}")
+    logger.warning("Account not found: %s", account_id)
     return None
 
 
@@ -49,36 +73,62 @@ def get_lead(lead_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Lead data dictionary or None if not found
     """
-    logger.info(f"Fetching lead: {lead_id}")
-    for lead in LEADS:
-        if lead["id"] == lead_id:
-            logger.info(f"Lead found: {lead['company']}")
-            return lead
+    logger.info("Fetching lead: %s", lead_id)
+    lead = LEADS_BY_ID.get(lead_id)
+    if lead is not None:
+        logger.debug("Lead found: %s", lead["company"])
+        return lead
 
-    logger.warning(f"Lead not found: {lead_id}")
+    logger.warning("Lead not found: %s", lead_id)
     return None
 
 
-def get_all_accounts() -> List[Dict[str, Any]]:
+def get_all_accounts() -> Tuple[Dict[str, Any], ...]:
     """
     Retrieve all accounts.
 
     Returns:
-        List of all account dictionaries
+        Tuple of all account dictionaries
     """
-    logger.info(f"Fetching all accounts (count: {len(ACCOUNTS)})")
-    return ACCOUNTS
+    logger.debug("Fetching all accounts")
+    return _ALL_ACCOUNTS
 
 
-def get_all_leads() -> List[Dict[str, Any]]:
+def get_all_leads() -> Tuple[Dict[str, Any], ...]:
     """
     Retrieve all leads.
 
     Returns:
-        List of all lead dictionaries
+        Tuple of all lead dictionaries
     """
-    logger.info(f"Fetching all leads (count: {len(LEADS)})")
-    return LEADS
+    logger.debug("Fetching all leads")
+    return _ALL_LEADS
+
+
+def _check_prediction_type(prediction_type: Any) -> None:
+    """Reject prediction types that cannot key the type index."""
+    if not isinstance(prediction_type, str):
+        raise TypeError(
+            f"prediction_type must be a string, got {type(prediction_type).__name__}"
+        )
+
+
+def _append_log(log_entry: Dict[str, Any]) -> None:
+    """
+    Append a log entry to the store and its indexes, evicting at capacity.
+    The index keys are checked before anything is mutated, so a bad entry
+    leaves the store and indexes untouched.
+    """
+    prediction_type = log_entry["prediction_type"]
+    _check_prediction_type(prediction_type)
+    hour = int(log_entry["timestamp_epoch"] // 3600)
+
+    if len(PREDICTION_LOGS) >= PREDICTION_LOG_CAPACITY:
+        _evict_oldest_log()
+
+    PREDICTION_LOGS.append(log_entry)
+    _LOGS_BY_TYPE[prediction_type].append(log_entry)
+    _LOGS_BY_HOUR[hour].append(log_entry)
 
 
 def store_prediction_log(
@@ -98,25 +148,29 @@ def store_prediction_log(
 
     Returns:
         Dictionary with log_id, timestamp, and success status
+
+    Raises:
+        TypeError: If prediction_type is not a string
     """
-    log_id = str(uuid.uuid4())
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    log_id = secrets.token_hex(8)
+    epoch = time.time()
+    timestamp = datetime.utcfromtimestamp(epoch).isoformat() + "Z"
 
     log_entry = {
         "log_id": log_id,
         "timestamp": timestamp,
+        "timestamp_epoch": epoch,
         "prediction_type": prediction_type,
         "input_data": input_data,
         "prediction_result": prediction_result,
         "model_version": model_version
     }
 
-    PREDICTION_LOGS.append(log_entry)
+    _append_log(log_entry)
 
     logger.info(
-        f"Stored prediction log: {log_id} | "
-        f"Type: {prediction_type} | "
-        f"Model: {model_version}"
+        "Stored prediction log: %s | Type: %s | Model: %s",
+        log_id, prediction_type, model_version
     )
 
     return {
@@ -126,6 +180,53 @@ def store_prediction_log(
     }
 
 
+def store_prediction_logs_bulk(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Store several prediction log entries at once, e.g. for a batch of tool calls.
+
+    All entries share one timestamp, taken when the batch is stored.
+
+    Args:
+        records: Dictionaries with prediction_type, input_data,
+            prediction_result, and model_version keys
+
+    Returns:
+        List of dictionaries with log_id, timestamp, and success status,
+        in the same order as the records
+
+    Raises:
+        TypeError: If any record's prediction_type is not a string; no
+            records are stored in that case
+    """
+    for record in records:
+        _check_prediction_type(record["prediction_type"])
+
+    epoch = time.time()
+    timestamp = datetime.utcfromtimestamp(epoch).isoformat() + "Z"
+
+    confirmations = []
+    for record in records:
+        log_id = secrets.token_hex(8)
+        _append_log({
+            "log_id": log_id,
+            "timestamp": timestamp,
+            "timestamp_epoch": epoch,
+            "prediction_type": record["prediction_type"],
+            "input_data": record["input_data"],
+            "prediction_result": record["prediction_result"],
+            "model_version": record["model_version"]
+        })
+        confirmations.append({
+            "log_id": log_id,
+            "timestamp": timestamp,
+            "stored_successfully": True
+        })
+
+    logger.info("Stored %d prediction logs", len(confirmations))
+
+    return confirmations
+
+
 def get_prediction_logs(
     prediction_type: Optional[str] = None,
     limit: int = 100
@@ -140,37 +241,79 @@ def get_prediction_logs(
     Returns:
         List of prediction log dictionaries
     """
-    logs = PREDICTION_LOGS
-
     if prediction_type:
-        logs = [log for log in logs if log["prediction_type"] == prediction_type]
+        logs = _LOGS_BY_TYPE.get(prediction_type, ())
+    else:
+        logs = PREDICTION_LOGS
 
-    # Return most recent first
-    logs = sorted(logs, key=lambda x: x["timestamp"], reverse=True)
+    # Logs are appended in timestamp order, so the tail holds the most recent;
+    # return it most recent first
+    logs = list(islice(reversed(logs), max(limit, 0)))
 
     logger.info(
-        f"Retrieved {len(logs[:limit])} prediction logs "
-        f"(type: {prediction_type or 'all'})"
+        "Retrieved %d prediction logs (type: %s)",
+        len(logs), prediction_type or "all"
     )
 
-    return logs[:limit]
+    return logs
+
+
+def _evict_oldest_log() -> None:
+    """Drop the oldest prediction log from the log store and its indexes."""
+    oldest = PREDICTION_LOGS.popleft()
+
+    # Each index is in insertion order, so the oldest entry is at its head
+    prediction_type = oldest["prediction_type"]
+    type_logs = _LOGS_BY_TYPE[prediction_type]
+    type_logs.popleft()
+    if not type_logs:
+        del _LOGS_BY_TYPE[prediction_type]
+
+    hour = int(oldest["timestamp_epoch"] // 3600)
+    bucket = _LOGS_BY_HOUR[hour]
+    bucket.popleft()
+    if not bucket:
+        del _LOGS_BY_HOUR[hour]
+
+
+def clear_prediction_logs() -> None:
+    """
+    Remove all prediction logs and reset the type and hour indexes.
+    """
+    PREDICTION_LOGS.clear()
+    _LOGS_BY_TYPE.clear()
+    _LOGS_BY_HOUR.clear()
+    logger.info("Cleared prediction logs")
 
 
 def get_prediction_count_24h() -> int:
     """
     Get count of predictions in last 24 hours.
-    For demo purposes, returns total count.
-    In production, would filter by timestamp.
+    Sums the hourly buckets fully inside the window and scans only the
+    oldest, partially covered bucket, so the cost does not grow with
+    total log volume.
 
     Returns:
         Count of recent predictions
     """
-    count = len(PREDICTION_LOGS)
-    logger.info(f"Total predictions logged: {count}")
+    now = time.time()
+    cutoff = now - 24 * 3600
+    current_hour = int(now // 3600)
+    oldest_hour = current_hour - 24
+
+    count = sum(
+        len(_LOGS_BY_HOUR.get(hour, ()))
+        for hour in range(oldest_hour + 1, current_hour + 1)
+    )
+    count += sum(
+        1 for log in _LOGS_BY_HOUR.get(oldest_hour, ())
+        if log["timestamp_epoch"] >= cutoff
+    )
+    logger.info("Predictions logged in last 24h: %d", count)
     return count
 
 
-def get_accounts_by_status(status: str) -> List[Dict[str, Any]]:
+def get_accounts_by_status(status: str) -> Tuple[Dict[str, Any], ...]:
     """
     Retrieve accounts filtered by status.
 
@@ -178,13 +321,62 @@ def get_accounts_by_status(status: str) -> List[Dict[str, Any]]:
         status: Account status (active, trial, at_risk, churned)
 
     Returns:
-        List of account dictionaries matching the status
+        Tuple of account dictionaries matching the status
+    """
+    accounts = ACCOUNTS_BY_STATUS.get(status, ())
+    logger.info("Found %d accounts with status: %s", len(accounts), status)
+    return accounts
+
+
+def get_accounts_by_industry(industry: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Retrieve accounts in an industry.
+
+    Args:
+        industry: Account industry (technology, finance, healthcare, etc.)
+
+    Returns:
+        Tuple of account dictionaries in the industry
+    """
+    accounts = ACCOUNTS_BY_INDUSTRY.get(industry, ())
+    logger.info("Found %d accounts in industry: %s", len(accounts), industry)
+    return accounts
+
+
+def get_accounts_by_industry_and_plan(industry: str, plan: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Retrieve accounts in an industry on a given plan (e.g. trials in saas).
+
+    Args:
+        industry: Account industry (technology, finance, healthcare, etc.)
+        plan: Account plan (trial, starter, professional, enterprise)
+
+    Returns:
+        Tuple of matching account dictionaries
     """
-    accounts = [acc for acc in ACCOUNTS if acc["status"] == status]
-    logger.info(f"Found {len(accounts)} accounts with status: {status}")
+    accounts = ACCOUNTS_BY_INDUSTRY_PLAN.get((industry, plan), ())
+    logger.info(
+        "Found %d accounts in industry: %s on plan: %s",
+        len(accounts), industry, plan
+    )
     return accounts
 
 
+def get_leads_by_industry(industry: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Retrieve leads in an industry.
+
+    Args:
+        industry: Lead industry (technology, finance, healthcare, etc.)
+
+    Returns:
+        Tuple of lead dictionaries in the industry
+    """
+    leads = LEADS_BY_INDUSTRY.get(industry, ())
+    logger.info("Found %d leads in industry: %s", len(leads), industry)
+    return leads
+
+
 def get_leads_by_tier(tier: str) -> List[Dict[str, Any]]:
     """
     Retrieve leads that would score in a particular tier.
@@ -198,5 +390,5 @@ def get_leads_by_tier(tier: str) -> List[Dict[str, Any]]:
     """
     # For demo purposes, returns all leads
     # In production, would filter by pre-computed scores
-    logger.info(f"Fetching leads for tier: {tier}")
+    logger.info("Fetching leads for tier: %s", tier)
     return LEADS
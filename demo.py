@@ -5,6 +5,9 @@ Run this to explore the system interactively.
 """
 
 import json
+import sys
+from collections import defaultdict
+from operator import itemgetter
 from scoring import score_lead, detect_churn_risk, calculate_conversion_probability
 from data_store import get_account, get_lead, get_all_accounts, get_all_leads
 from config import MODEL_VERSION
@@ -24,7 +27,8 @@ def print_section(title):
 
 def print_json(data):
     """Pretty print JSON data."""
-    print(json.dumps(data, indent=2))
+    json.dump(data, sys.stdout, indent=2)
+    sys.stdout.write("\n")
 
 
 def show_menu():
@@ -48,12 +52,9 @@ def browse_accounts():
     print_section("Sample Accounts (20 total)")
     print("\nAccount Tiers:")
 
-    by_plan = {}
+    by_plan = defaultdict(list)
     for acc in accounts:
-        plan = acc['plan']
-        if plan not in by_plan:
-            by_plan[plan] = []
-        by_plan[plan].append(acc)
+        by_plan[acc['plan']].append(acc)
 
     for plan in ['enterprise', 'professional', 'starter', 'trial']:
         if plan in by_plan:
@@ -85,9 +86,10 @@ def browse_leads():
         signals = lead['signals']
         demo = "✓" if signals.get('demo_requested') else " "
         trial = "✓" if signals.get('free_trial_started') else " "
-        engagement = signals.get('email_engagement_score', 0)
+        company_col = lead['company'].ljust(35)
+        engagement_col = str(signals.get('email_engagement_score', 0)).rjust(3)
 
-        print(f"  {lead['id']}: {lead['company']:<35} | Demo:{demo} Trial:{trial} | Engagement:{engagement:>3}")
+        print(f"  {lead['id']}: {company_col} | Demo:{demo} Trial:{trial} | Engagement:{engagement_col}")
 
     print("\n\nPick a lead to see details (or press Enter to skip):")
     choice = input("  Lead ID (e.g., lead_001): ").strip()
@@ -142,7 +144,7 @@ def demo_lead_scoring():
     print(f"  📝 Explanation: {result['explanation']}")
 
     print("\n  📊 Top Feature Contributions:")
-    sorted_attrs = sorted(result['feature_attributions'], key=lambda x: x['contribution'], reverse=True)
+    sorted_attrs = sorted(result['feature_attributions'], key=itemgetter('contribution'), reverse=True)
     for attr in sorted_attrs[:5]:
         impact_emoji = "📈" if attr['impact'] == 'positive' else "📉" if attr['impact'] == 'negative' else "➖"
         print(f"    {impact_emoji} {attr['feature_name']:<30} {attr['contribution']:>5.1f}% | Value: {attr['value']}")
@@ -251,7 +253,7 @@ def show_model_info():
 
     from config import (
         MODEL_VERSION, TRAINING_DATE, MODEL_PERFORMANCE_METRICS,
-        FEATURE_IMPORTANCE, LEAD_TIER_THRESHOLDS, CHURN_RISK_THRESHOLDS
+        FEATURE_IMPORTANCE_SORTED, LEAD_TIER_THRESHOLDS, CHURN_RISK_THRESHOLDS
     )
 
     print(f"\n  Model Version: {MODEL_VERSION}")
@@ -270,8 +272,7 @@ def show_model_info():
         print(f"    {tier}: ≥{threshold}")
 
     print("\n  Top 5 Feature Importance:")
-    sorted_features = sorted(FEATURE_IMPORTANCE.items(), key=lambda x: x[1], reverse=True)
-    for feature, importance in sorted_features[:5]:
+    for feature, importance in FEATURE_IMPORTANCE_SORTED[:5]:
         bar_length = int(importance * 50)
         bar = "█" * bar_length
         print(f"    {feature:<30} {bar} {importance:.2f}")
@@ -327,6 +328,18 @@ def show_mcp_tools():
     print("  • explain-low-score - Lead score explanation template")
 
 
+# Menu choice -> handler
+MENU_ACTIONS = {
+    "1": browse_accounts,
+    "2": browse_leads,
+    "3": demo_lead_scoring,
+    "4": demo_churn_detection,
+    "5": demo_conversion,
+    "6": show_model_info,
+    "7": show_mcp_tools,
+}
+
+
 def main():
     """Main interactive loop."""
     while True:
@@ -336,20 +349,10 @@ def main():
         if choice == "0":
             print("\n👋 Thanks for exploring the Revenue Intelligence System!\n")
             break
-        elif choice == "1":
-            browse_accounts()
-        elif choice == "2":
-            browse_leads()
-        elif choice == "3":
-            demo_lead_scoring()
-        elif choice == "4":
-            demo_churn_detection()
-        elif choice == "5":
-            demo_conversion()
-        elif choice == "6":
-            show_model_info()
-        elif choice == "7":
-            show_mcp_tools()
+
+        action = MENU_ACTIONS.get(choice)
+        if action:
+            action()
         else:
             print("\n  ⚠️  Invalid choice. Please try again.")
 
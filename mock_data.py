@@ -4,7 +4,9 @@ Contains realistic sample accounts, leads, and prediction logs.
 In production, this would be replaced with database/data warehouse connections.
 """
 
-from typing import List, Dict, Any
+from collections import deque
+from operator import itemgetter
+from typing import Callable, Deque, FrozenSet, List, Dict, Any, Tuple
 
 # In-memory storage for accounts (simulates CRM data)
 ACCOUNTS: List[Dict[str, Any]] = [
@@ -834,6 +836,37 @@ LEADS: List[Dict[str, Any]] = [
     }
 ]
 
-# In-memory storage for prediction logs (append-only)
+
+def _group_by(
+    records: List[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], Any]
+) -> Dict[Any, Tuple[Dict[str, Any], ...]]:
+    """
+    Group records by a key function (e.g. itemgetter("status")), preserving record order.
+    Groups are frozen as tuples so callers can share them without copying.
+    """
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(key(record), []).append(record)
+    return {group_key: tuple(group) for group_key, group in groups.items()}
+
+
+# Indexes over the records above (built once at import)
+ACCOUNTS_BY_ID: Dict[str, Dict[str, Any]] = {account["id"]: account for account in ACCOUNTS}
+LEADS_BY_ID: Dict[str, Dict[str, Any]] = {lead["id"]: lead for lead in LEADS}
+ACCOUNTS_BY_STATUS: Dict[str, Tuple[Dict[str, Any], ...]] = _group_by(ACCOUNTS, itemgetter("status"))
+ACCOUNTS_BY_INDUSTRY: Dict[str, Tuple[Dict[str, Any], ...]] = _group_by(ACCOUNTS, itemgetter("industry"))
+LEADS_BY_INDUSTRY: Dict[str, Tuple[Dict[str, Any], ...]] = _group_by(LEADS, itemgetter("industry"))
+
+# Industry x plan cross-tab of accounts, keyed by (industry, plan)
+ACCOUNTS_BY_INDUSTRY_PLAN: Dict[Tuple[str, str], Tuple[Dict[str, Any], ...]] = _group_by(
+    ACCOUNTS, itemgetter("industry", "plan")
+)
+
+# Distinct account statuses and plans
+ACCOUNT_STATUSES: FrozenSet[str] = frozenset(ACCOUNTS_BY_STATUS)
+ACCOUNT_PLANS: FrozenSet[str] = frozenset(account["plan"] for account in ACCOUNTS)
+
+# In-memory storage for prediction logs (append-only, oldest evicted at capacity)
 # In production, this would be written to a data warehouse with proper partitioning
-PREDICTION_LOGS: List[Dict[str, Any]] = []
+PREDICTION_LOGS: Deque[Dict[str, Any]] = deque()
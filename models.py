@@ -1,14 +1,33 @@
 """
 Data models for the Revenue Intelligence MCP server.
-Uses dataclasses with type hints for production-ready code.
+Uses slotted, frozen dataclasses with type hints for production-ready code.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _field_getter(cls: type) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]:
+    """Field names of a dataclass and a getter returning their values as a tuple."""
+    names = tuple(f.name for f in fields(cls))
+    if len(names) == 1:
+        # attrgetter with one name returns the bare value, not a 1-tuple
+        getter = attrgetter(names[0])
+        return names, lambda obj: (getter(obj),)
+    return names, attrgetter(*names)
+
+
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    """Convert a model instance to a field -> value dictionary."""
+    names, getter = _field_getter(type(obj))
+    return dict(zip(names, getter(obj)))
+
+
+@dataclass(slots=True, frozen=True)
 class UsageSignals:
     """Usage metrics for an account."""
     daily_active_users: int
@@ -18,8 +37,23 @@ class UsageSignals:
     nps_score: Optional[int] = None
     login_frequency_7d: int = 0
 
-
-@dataclass
+    def __post_init__(self) -> None:
+        # Stripped under python -O: __debug__ is a compile-time constant
+        if __debug__:
+            counts = (
+                self.daily_active_users,
+                self.features_adopted,
+                self.api_calls_per_day,
+                self.support_tickets_30d,
+                self.login_frequency_7d
+            )
+            if any(count < 0 for count in counts):
+                raise ValueError("Usage counts must be non-negative")
+            if self.nps_score is not None and not 0 <= self.nps_score <= 10:
+                raise ValueError(f"nps_score must be between 0 and 10, got {self.nps_score}")
+
+
+@dataclass(slots=True, frozen=True)
 class Account:
     """Customer account model with business metrics."""
     id: str
@@ -33,19 +67,10 @@ class Account:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "id": self.id,
-            "company": self.company,
-            "plan": self.plan,
-            "mrr": self.mrr,
-            "created_date": self.created_date,
-            "usage_signals": self.usage_signals,
-            "industry": self.industry,
-            "status": self.status
-        }
-
-
-@dataclass
+        return _to_dict(self)
+
+
+@dataclass(slots=True, frozen=True)
 class LeadSignals:
     """Engagement signals for a lead."""
     website_visits_30d: int
@@ -55,8 +80,19 @@ class LeadSignals:
     linkedin_engagement: bool = False
     free_trial_started: bool = False
 
+    def __post_init__(self) -> None:
+        # Stripped under python -O: __debug__ is a compile-time constant
+        if __debug__:
+            if self.website_visits_30d < 0 or self.whitepaper_downloads < 0:
+                raise ValueError("Lead activity counts must be non-negative")
+            if not 0 <= self.email_engagement_score <= 100:
+                raise ValueError(
+                    f"email_engagement_score must be between 0 and 100, "
+                    f"got {self.email_engagement_score}"
+                )
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Lead:
     """Potential customer lead model."""
     id: str
@@ -69,18 +105,10 @@ class Lead:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "id": self.id,
-            "company": self.company,
-            "industry": self.industry,
-            "employee_count": self.employee_count,
-            "signals": self.signals,
-            "contact_name": self.contact_name,
-            "contact_title": self.contact_title
-        }
-
-
-@dataclass
+        return _to_dict(self)
+
+
+@dataclass(slots=True, frozen=True)
 class FeatureAttribution:
     """Explains which features contributed to a prediction."""
     feature_name: str
@@ -89,7 +117,7 @@ class FeatureAttribution:
     impact: str  # positive, negative, neutral
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PredictionResult:
     """Result from a lead scoring prediction."""
     score: float  # 0-100
@@ -101,21 +129,15 @@ class PredictionResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "score": self.score,
-            "tier": self.tier,
-            "feature_attributions": self.feature_attributions,
-            "explanation": self.explanation,
-            "model_version": self.model_version,
-            "timestamp": self.timestamp
-        }
+        return _to_dict(self)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PredictionLog:
     """Log entry for a prediction, used for monitoring and drift detection."""
     log_id: str
     timestamp: str
+    timestamp_epoch: float  # Unix time of timestamp; keys the hourly time-window index
     prediction_type: str  # lead_score, churn_risk, conversion_probability
     input_data: Dict[str, Any]
     prediction_result: Dict[str, Any]
@@ -123,17 +145,10 @@ class PredictionLog:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "log_id": self.log_id,
-            "timestamp": self.timestamp,
-            "prediction_type": self.prediction_type,
-            "input_data": self.input_data,
-            "prediction_result": self.prediction_result,
-            "model_version": self.model_version
-        }
+        return _to_dict(self)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelMetadata:
     """Metadata about the ML model."""
     model_version: str
@@ -144,10 +159,4 @@ class ModelMetadata:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "model_version": self.model_version,
-            "training_date": self.training_date,
-            "performance_metrics": self.performance_metrics,
-            "feature_importance": self.feature_importance,
-            "drift_status": self.drift_status
-        }
+        return _to_dict(self)
@@ -4,17 +4,21 @@ Implements lead scoring, churn detection, and conversion prediction.
 """
 
 import logging
-from datetime import datetime
+import time
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
 
 from config import (
     MODEL_VERSION,
     LEAD_SCORE_WEIGHTS,
-    LEAD_TIER_THRESHOLDS,
-    CHURN_RISK_THRESHOLDS,
-    CONVERSION_THRESHOLDS,
+    LEAD_TIERS_SORTED,
+    CHURN_RISK_TIERS_SORTED,
+    CONVERSION_TIERS_SORTED,
     INDUSTRY_FIT_SCORES,
-    get_company_size_score
+    INDUSTRY_FIT_DEFAULT,
+    get_company_size_score,
+    tier_for_score
 )
 from models import PredictionResult
 
@@ -25,6 +29,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Lead score weights are fixed for a deployed model version; bind them once
+# rather than looking them up in LEAD_SCORE_WEIGHTS on every call
+_COMPANY_SIZE_WEIGHT = LEAD_SCORE_WEIGHTS["company_size"]
+_ENGAGEMENT_WEIGHT = LEAD_SCORE_WEIGHTS["engagement_signals"]
+_INDUSTRY_FIT_WEIGHT = LEAD_SCORE_WEIGHTS["industry_fit"]
+_INTENT_WEIGHT = LEAD_SCORE_WEIGHTS["intent_signals"]
+
+# Bound once; called as _industry_fit(industry, INDUSTRY_FIT_DEFAULT)
+_industry_fit = INDUSTRY_FIT_SCORES.get
+
+# (epoch millisecond, formatted timestamp) for the most recent call to _utc_timestamp
+_timestamp_cache = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time as an ISO 8601 string with millisecond precision.
+    The formatted string is reused for every call within the same millisecond.
+    """
+    global _timestamp_cache
+
+    now_ms = time.time_ns() // 1_000_000
+    cached = _timestamp_cache
+    if now_ms != cached[0]:
+        seconds, millis = divmod(now_ms, 1000)
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        cached = (now_ms, f"{formatted}.{millis:03d}Z")
+        _timestamp_cache = cached
+    return cached[1]
+
 
 def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
     """
@@ -40,7 +74,6 @@ def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dic
 
     # Website visits (0-100 scale, cap at 50 visits = 100)
     website_visits = signals.get("website_visits_30d", 0)
-    website_score = min(100, (website_visits / 50) * 100)
     attributions.append({
         "feature_name": "website_visits_30d",
         "contribution": 25.0,
@@ -59,7 +92,6 @@ def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dic
 
     # Demo requested (binary, worth 20 points)
     demo_requested = signals.get("demo_requested", False)
-    demo_score = 100 if demo_requested else 0
     attributions.append({
         "feature_name": "demo_requested",
         "contribution": 20.0,
@@ -69,7 +101,6 @@ def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dic
 
     # Free trial started (binary, worth 15 points)
     trial_started = signals.get("free_trial_started", False)
-    trial_score = 100 if trial_started else 0
     attributions.append({
         "feature_name": "free_trial_started",
         "contribution": 15.0,
@@ -79,7 +110,6 @@ def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dic
 
     # Whitepaper downloads (cap at 5 = 100)
     whitepaper_downloads = signals.get("whitepaper_downloads", 0)
-    whitepaper_score = min(100, (whitepaper_downloads / 5) * 100)
     attributions.append({
         "feature_name": "whitepaper_downloads",
         "contribution": 10.0,
@@ -87,8 +117,28 @@ def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dic
         "impact": "positive" if whitepaper_downloads > 2 else "neutral"
     })
 
-    # Calculate weighted average
-    total_score = (
+    total_score = _engagement_value(
+        website_visits, email_score, demo_requested, trial_started, whitepaper_downloads
+    )
+
+    return total_score, attributions
+
+
+def _engagement_value(
+    website_visits: float,
+    email_score: float,
+    demo_requested: bool,
+    trial_started: bool,
+    whitepaper_downloads: float
+) -> float:
+    """Weighted engagement score (0-100) from raw engagement signals."""
+    # Website visits cap at 50 = 100; whitepaper downloads cap at 5 = 100
+    website_score = min(100, (website_visits / 50) * 100)
+    demo_score = 100 if demo_requested else 0
+    trial_score = 100 if trial_started else 0
+    whitepaper_score = min(100, (whitepaper_downloads / 5) * 100)
+
+    return (
         website_score * 0.25 +
         email_score * 0.30 +
         demo_score * 0.20 +
@@ -96,8 +146,6 @@ def calculate_engagement_score(signals: Dict[str, Any]) -> Tuple[float, List[Dic
         whitepaper_score * 0.10
     )
 
-    return total_score, attributions
-
 
 def calculate_intent_score(signals: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
     """
@@ -113,7 +161,7 @@ def calculate_intent_score(signals: Dict[str, Any]) -> Tuple[float, List[Dict[st
 
     # LinkedIn engagement (binary)
     linkedin = signals.get("linkedin_engagement", False)
-    linkedin_score = 100 if linkedin else 40
+    linkedin_score = _intent_value(linkedin)
     attributions.append({
         "feature_name": "linkedin_engagement",
         "contribution": 100.0,
@@ -124,6 +172,58 @@ def calculate_intent_score(signals: Dict[str, Any]) -> Tuple[float, List[Dict[st
     return linkedin_score, attributions
 
 
+def _intent_value(linkedin_engagement: bool) -> float:
+    """Intent score (0-100) from raw intent signals."""
+    return 100 if linkedin_engagement else 40
+
+
+def _weighted_lead_score(
+    company_size_score: float,
+    engagement_score: float,
+    industry_score: float,
+    intent_score: float
+) -> float:
+    """Combine component scores into the final lead score."""
+    return (
+        company_size_score * _COMPANY_SIZE_WEIGHT +
+        engagement_score * _ENGAGEMENT_WEIGHT +
+        industry_score * _INDUSTRY_FIT_WEIGHT +
+        intent_score * _INTENT_WEIGHT
+    )
+
+
+def calculate_lead_score(
+    signals: Dict[str, Any],
+    industry: str = "technology",
+    employee_count: int = 100
+) -> float:
+    """
+    Calculate a lead's score without building attributions or an explanation.
+
+    Args:
+        signals: Dictionary of engagement/intent signals
+        industry: Company industry
+        employee_count: Number of employees
+
+    Returns:
+        Unrounded lead score (0-100), identical to score_lead's
+    """
+    engagement_score = _engagement_value(
+        signals.get("website_visits_30d", 0),
+        signals.get("email_engagement_score", 0),
+        signals.get("demo_requested", False),
+        signals.get("free_trial_started", False),
+        signals.get("whitepaper_downloads", 0)
+    )
+
+    return _weighted_lead_score(
+        get_company_size_score(employee_count),
+        engagement_score,
+        _industry_fit(industry, INDUSTRY_FIT_DEFAULT),
+        _intent_value(signals.get("linkedin_engagement", False))
+    )
+
+
 def score_lead(
     company_name: str,
     signals: Dict[str, Any],
@@ -142,7 +242,7 @@ def score_lead(
     Returns:
         Dictionary containing score, tier, attributions, and explanation
     """
-    logger.info(f"Scoring lead: {company_name} ({industry}, {employee_count} employees)")
+    logger.info("Scoring lead: %s (%s, %s employees)", company_name, industry, employee_count)
 
     all_attributions = []
 
@@ -150,7 +250,7 @@ def score_lead(
     company_size_score = get_company_size_score(employee_count)
     all_attributions.append({
         "feature_name": "company_size",
-        "contribution": LEAD_SCORE_WEIGHTS["company_size"] * 100,
+        "contribution": _COMPANY_SIZE_WEIGHT * 100,
         "value": employee_count,
         "impact": "positive" if company_size_score > 70 else "neutral"
     })
@@ -159,14 +259,14 @@ def score_lead(
     engagement_score, engagement_attrs = calculate_engagement_score(signals)
     for attr in engagement_attrs:
         # Scale contribution by weight
-        attr["contribution"] = attr["contribution"] * LEAD_SCORE_WEIGHTS["engagement_signals"]
+        attr["contribution"] = attr["contribution"] * _ENGAGEMENT_WEIGHT
         all_attributions.append(attr)
 
     # 3. Industry fit (20% weight)
-    industry_score = INDUSTRY_FIT_SCORES.get(industry, INDUSTRY_FIT_SCORES["default"])
+    industry_score = _industry_fit(industry, INDUSTRY_FIT_DEFAULT)
     all_attributions.append({
         "feature_name": "industry_fit",
-        "contribution": LEAD_SCORE_WEIGHTS["industry_fit"] * 100,
+        "contribution": _INDUSTRY_FIT_WEIGHT * 100,
         "value": industry,
         "impact": "positive" if industry_score > 70 else "neutral"
     })
@@ -174,31 +274,23 @@ def score_lead(
     # 4. Intent signals (20% weight)
     intent_score, intent_attrs = calculate_intent_score(signals)
     for attr in intent_attrs:
-        attr["contribution"] = attr["contribution"] * LEAD_SCORE_WEIGHTS["intent_signals"]
+        attr["contribution"] = attr["contribution"] * _INTENT_WEIGHT
         all_attributions.append(attr)
 
     # Calculate final weighted score
-    final_score = (
-        company_size_score * LEAD_SCORE_WEIGHTS["company_size"] +
-        engagement_score * LEAD_SCORE_WEIGHTS["engagement_signals"] +
-        industry_score * LEAD_SCORE_WEIGHTS["industry_fit"] +
-        intent_score * LEAD_SCORE_WEIGHTS["intent_signals"]
+    final_score = _weighted_lead_score(
+        company_size_score, engagement_score, industry_score, intent_score
     )
 
     # Determine tier
-    if final_score >= LEAD_TIER_THRESHOLDS["hot"]:
-        tier = "hot"
-    elif final_score >= LEAD_TIER_THRESHOLDS["warm"]:
-        tier = "warm"
-    else:
-        tier = "cold"
+    tier = tier_for_score(final_score, LEAD_TIERS_SORTED)
 
     # Generate explanation
     explanation = generate_lead_explanation(
         company_name, final_score, tier, signals, industry, employee_count
     )
 
-    logger.info(f"Lead scored: {company_name} = {final_score:.1f} ({tier})")
+    logger.info("Lead scored: %s = %.1f (%s)", company_name, final_score, tier)
 
     return {
         "score": round(final_score, 2),
@@ -206,7 +298,7 @@ def score_lead(
         "feature_attributions": all_attributions,
         "explanation": explanation,
         "model_version": MODEL_VERSION,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": _utc_timestamp()
     }
 
 
@@ -220,13 +312,11 @@ def generate_lead_explanation(
 ) -> str:
     """Generate human-readable explanation for lead score."""
 
-    explanation_parts = [
-        f"{company_name} scored {score:.1f}/100 ({tier} tier)."
-    ]
+    demo_requested = signals.get("demo_requested")
 
     # Key positive signals
     positives = []
-    if signals.get("demo_requested"):
+    if demo_requested:
         positives.append("demo requested")
     if signals.get("free_trial_started"):
         positives.append("free trial started")
@@ -235,22 +325,68 @@ def generate_lead_explanation(
     if employee_count >= 500:
         positives.append("enterprise size")
 
-    if positives:
-        explanation_parts.append(f" Strong signals: {', '.join(positives)}.")
-
     # Areas for improvement
     concerns = []
     if signals.get("website_visits_30d", 0) < 10:
         concerns.append("low website engagement")
-    if not signals.get("demo_requested"):
+    if not demo_requested:
         concerns.append("no demo requested")
     if employee_count < 50:
         concerns.append("small company size")
 
-    if concerns and tier != "hot":
-        explanation_parts.append(f" Areas to improve: {', '.join(concerns)}.")
+    strengths = f" Strong signals: {', '.join(positives)}." if positives else ""
+    improvements = (
+        f" Areas to improve: {', '.join(concerns)}." if concerns and tier != "hot" else ""
+    )
 
-    return "".join(explanation_parts)
+    return f"{company_name} scored {score:.1f}/100 ({tier} tier).{strengths}{improvements}"
+
+
+def batch_score_leads(
+    leads: List[Dict[str, Any]],
+    include_details: bool = False,
+    company_key: str = "company"
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of leads, e.g. a nightly rescore of the whole pipeline.
+
+    Args:
+        leads: Lead dictionaries with company, signals, industry, and employee_count
+        include_details: If True, return full score_lead results with
+            attributions and explanations; otherwise only company, score,
+            and tier per lead
+        company_key: Key holding the company name in each lead
+            (e.g. "company_name" for score_lead-shaped arguments)
+
+    Returns:
+        List of scoring results, in the same order as the input leads
+    """
+    logger.info("Batch scoring %d leads", len(leads))
+
+    if not include_details:
+        results = []
+        for lead in leads:
+            score = calculate_lead_score(
+                lead["signals"],
+                lead.get("industry", "technology"),
+                lead.get("employee_count", 100)
+            )
+            results.append({
+                "company": lead[company_key],
+                "score": round(score, 2),
+                "tier": tier_for_score(score, LEAD_TIERS_SORTED)
+            })
+        return results
+
+    return [
+        score_lead(
+            company_name=lead[company_key],
+            signals=lead["signals"],
+            industry=lead.get("industry", "technology"),
+            employee_count=lead.get("employee_count", 100)
+        )
+        for lead in leads
+    ]
 
 
 def detect_churn_risk(account_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -266,7 +402,7 @@ def detect_churn_risk(account_data: Dict[str, Any]) -> Dict[str, Any]:
     company = account_data["company"]
     usage = account_data["usage_signals"]
 
-    logger.info(f"Calculating churn risk for: {company}")
+    logger.info("Calculating churn risk for: %s", company)
 
     risk_factors = []
     risk_score = 0.0
@@ -312,19 +448,12 @@ def detect_churn_risk(account_data: Dict[str, Any]) -> Dict[str, Any]:
         risk_factors.append("Low feature adoption")
 
     # Determine risk tier
-    if risk_score >= CHURN_RISK_THRESHOLDS["critical"]:
-        risk_tier = "critical"
-    elif risk_score >= CHURN_RISK_THRESHOLDS["high"]:
-        risk_tier = "high"
-    elif risk_score >= CHURN_RISK_THRESHOLDS["medium"]:
-        risk_tier = "medium"
-    else:
-        risk_tier = "low"
+    risk_tier = tier_for_score(risk_score, CHURN_RISK_TIERS_SORTED)
 
     # Generate intervention suggestions
     interventions = generate_intervention_suggestions(risk_factors, account_data)
 
-    logger.info(f"Churn risk calculated: {company} = {risk_score:.1f} ({risk_tier})")
+    logger.info("Churn risk calculated: %s = %.1f (%s)", company, risk_score, risk_tier)
 
     return {
         "account_id": account_data["id"],
@@ -334,32 +463,80 @@ def detect_churn_risk(account_data: Dict[str, Any]) -> Dict[str, Any]:
         "declining_signals": risk_factors,
         "suggested_interventions": interventions,
         "model_version": MODEL_VERSION,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": _utc_timestamp()
     }
 
 
+def batch_detect_churn_risk(accounts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Calculate churn risk for a batch of accounts, e.g. a sweep of a CS book.
+
+    Args:
+        accounts: Account dictionaries with usage signals
+
+    Returns:
+        List of churn risk results, in the same order as the input accounts
+    """
+    logger.info("Batch calculating churn risk for %d accounts", len(accounts))
+
+    return [detect_churn_risk(account) for account in accounts]
+
+
+# Interventions as bit flags, so that suggestions for several risk factors
+# combine with a bitwise OR and each is emitted at most once
+_EXECUTIVE_REVIEW = 1 << 0
+_ONBOARDING_SESSION = 1 << 1
+_FEATURE_DEMO = 1 << 2
+
+_INTERVENTION_TEXT = (
+    (_EXECUTIVE_REVIEW, "Schedule executive business review to address concerns"),
+    (_ONBOARDING_SESSION, "Provide personalized onboarding/training session"),
+    (_FEATURE_DEMO, "Demonstrate advanced features relevant to their use case")
+)
+
+
+@lru_cache(maxsize=256)
+def _interventions_for_factor(factor: str) -> int:
+    """Bit flags of the interventions that address a risk factor."""
+    mask = 0
+    if "NPS" in factor or "support ticket" in factor:
+        mask |= _EXECUTIVE_REVIEW
+    if "daily active" in factor or "login" in factor:
+        mask |= _ONBOARDING_SESSION
+    if "feature adoption" in factor:
+        mask |= _FEATURE_DEMO
+    return mask
+
+
 def generate_intervention_suggestions(
     risk_factors: List[str],
     account_data: Dict[str, Any]
 ) -> List[str]:
     """Generate suggested interventions based on risk factors."""
 
-    interventions = []
-
+    mask = 0
     for factor in risk_factors:
-        if "NPS" in factor or "support ticket" in factor:
-            interventions.append("Schedule executive business review to address concerns")
-        if "daily active" in factor or "login" in factor:
-            interventions.append("Provide personalized onboarding/training session")
-        if "feature adoption" in factor:
-            interventions.append("Demonstrate advanced features relevant to their use case")
+        mask |= _interventions_for_factor(factor)
+
+    interventions = [text for flag, text in _INTERVENTION_TEXT if mask & flag]
 
     # Add account-specific suggestions
     if account_data["plan"] == "starter":
         interventions.append("Explore upsell to Professional tier with more features")
 
-    # Remove duplicates
-    return list(set(interventions))
+    return interventions
+
+
+# Conversion probability bonuses: lower bound of each usage bucket, and the
+# bonus for each bucket (one below the first bound)
+_DAU_CUTOFFS = (5, 10, 15)
+_DAU_BONUSES = (0.0, 0.10, 0.20, 0.30)
+_FEATURE_CUTOFFS = (2, 3, 5)
+_FEATURE_BONUSES = (0.0, 0.05, 0.15, 0.25)
+_API_CUTOFFS = (50, 150, 300)
+_API_BONUSES = (0.0, 0.05, 0.10, 0.20)
+_LOGIN_CUTOFFS = (5, 10, 14)
+_LOGIN_BONUSES = (0.0, 0.05, 0.15, 0.25)
 
 
 def calculate_conversion_probability(account_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -375,46 +552,20 @@ def calculate_conversion_probability(account_data: Dict[str, Any]) -> Dict[str,
     company = account_data["company"]
     usage = account_data["usage_signals"]
 
-    logger.info(f"Calculating conversion probability for: {company}")
-
-    # Simple scoring model
-    probability = 0.0
+    logger.info("Calculating conversion probability for: %s", company)
 
-    # High DAU is strong signal
+    # Simple scoring model: a fixed bonus per usage signal bucket
     dau = usage.get("daily_active_users", 0)
-    if dau >= 15:
-        probability += 0.30
-    elif dau >= 10:
-        probability += 0.20
-    elif dau >= 5:
-        probability += 0.10
-
-    # Feature adoption
     features = usage.get("features_adopted", 0)
-    if features >= 5:
-        probability += 0.25
-    elif features >= 3:
-        probability += 0.15
-    elif features >= 2:
-        probability += 0.05
-
-    # API usage
     api_calls = usage.get("api_calls_per_day", 0)
-    if api_calls >= 300:
-        probability += 0.20
-    elif api_calls >= 150:
-        probability += 0.10
-    elif api_calls >= 50:
-        probability += 0.05
-
-    # Login frequency
     login_freq = usage.get("login_frequency_7d", 0)
-    if login_freq >= 14:
-        probability += 0.25
-    elif login_freq >= 10:
-        probability += 0.15
-    elif login_freq >= 5:
-        probability += 0.05
+
+    probability = (
+        _DAU_BONUSES[bisect_right(_DAU_CUTOFFS, dau)] +
+        _FEATURE_BONUSES[bisect_right(_FEATURE_CUTOFFS, features)] +
+        _API_BONUSES[bisect_right(_API_CUTOFFS, api_calls)] +
+        _LOGIN_BONUSES[bisect_right(_LOGIN_CUTOFFS, login_freq)]
+    )
 
     # Determine trial day (mock calculation)
     trial_day = 10  # Would calculate from created_date in production
@@ -429,37 +580,33 @@ def calculate_conversion_probability(account_data: Dict[str, Any]) -> Dict[str,
         engagement_signals.append(f"Active API integration ({api_calls} calls/day)")
 
     # Recommendations
+    probability_tier = get_probability_tier(probability)
     recommendations = []
-    if probability >= CONVERSION_THRESHOLDS["high"]:
+    if probability_tier == "high":
         recommendations.append("Send upgrade prompt with success stories")
         recommendations.append("Offer onboarding call to ensure success")
-    elif probability >= CONVERSION_THRESHOLDS["medium"]:
+    elif probability_tier == "medium":
         recommendations.append("Provide feature tutorial to drive adoption")
         recommendations.append("Share case study from similar customer")
     else:
         recommendations.append("Increase engagement with personalized outreach")
         recommendations.append("Identify and remove adoption blockers")
 
-    logger.info(f"Conversion probability: {company} = {probability:.2%}")
+    logger.info("Conversion probability: %s = %.2f%%", company, probability * 100)
 
     return {
         "account_id": account_data["id"],
         "company": company,
         "trial_day": trial_day,
         "conversion_probability": round(probability, 3),
-        "probability_tier": get_probability_tier(probability),
+        "probability_tier": probability_tier,
         "key_engagement_signals": engagement_signals,
         "recommended_actions": recommendations,
         "model_version": MODEL_VERSION,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": _utc_timestamp()
     }
 
 
 def get_probability_tier(probability: float) -> str:
     """Determine tier based on probability."""
-    if probability >= CONVERSION_THRESHOLDS["high"]:
-        return "high"
-    elif probability >= CONVERSION_THRESHOLDS["medium"]:
-        return "medium"
-    else:
-        return "low"
+    return tier_for_score(probability, CONVERSION_TIERS_SORTED)
@@ -7,10 +7,16 @@ for customer-facing business teams. Provides lead scoring, churn detection,
 and conversion insights with full observability.
 """
 
+import hashlib
+import json
 import logging
-from typing import Any
-from datetime import datetime, timedelta
+import time
+from functools import lru_cache
+from collections import defaultdict, deque
+from typing import Any, Callable, DefaultDict, Deque, Dict, List, Optional, Tuple
+from datetime import datetime
 
+import jsonschema
 import mcp.types as types
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -20,6 +26,10 @@ from config import (
     TRAINING_DATE,
     MODEL_PERFORMANCE_METRICS,
     FEATURE_IMPORTANCE,
+    BATCH_MAX_CALLS,
+    BATCH_MAX_LEADS,
+    TOOL_FAILURE_LIMIT,
+    TOOL_FAILURE_WINDOW_SECONDS,
     LOG_LEVEL,
     LOG_FORMAT
 )
@@ -27,11 +37,13 @@ from data_store import (
     get_account,
     get_lead,
     store_prediction_log,
+    store_prediction_logs_bulk,
     get_prediction_count_24h,
     get_all_accounts
 )
 from scoring import (
     score_lead,
+    batch_score_leads,
     detect_churn_risk,
     calculate_conversion_probability
 )
@@ -43,8 +55,268 @@ logger = logging.getLogger(__name__)
 # Initialize MCP server
 app = Server("revenue-intel-mcp")
 
-# Track server start time for uptime calculation
+# Track server start time (reported in the startup log line); uptime is
+# measured on the monotonic clock, which is cheaper to read and unaffected
+# by wall-clock adjustments
 SERVER_START_TIME = datetime.utcnow()
+_START_MONOTONIC = time.monotonic()
+
+# (tool name, digest of canonical arguments) -> monotonic times of recent failures
+_tool_failures: DefaultDict[Tuple[str, bytes], Deque[float]] = defaultdict(deque)
+
+# Monotonic time of the most recent failure; once the window has passed
+# since then, every tracked failure is stale
+_last_failure_time = 0.0
+
+
+def _to_json(obj: Any) -> str:
+    """
+    Serialize a resource or tool response compactly.
+    Responses are read by MCP clients, not people; without indent the
+    encoder stays on its C fast path and the payload is smaller.
+    """
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Static resource, tool, and prompt listings, built once at import
+_RESOURCES: list[types.Resource] = [
+    types.Resource(
+        uri="crm://accounts/list",
+        name="All CRM Accounts",
+        mimeType="application/json",
+        description="List of all customer accounts with usage signals"
+    ),
+    types.Resource(
+        uri="models://lead_scorer/metadata",
+        name="Lead Scorer Model Metadata",
+        mimeType="application/json",
+        description="Model version, performance metrics, and drift status"
+    )
+]
+
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="score_lead",
+        description="Score a lead based on company attributes and engagement signals. Returns score (0-100), tier (hot/warm/cold), and feature attributions.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "company_name": {
+                    "type": "string",
+                    "description": "Name of the company"
+                },
+                "signals": {
+                    "type": "object",
+                    "description": "Engagement signals (website_visits_30d, demo_requested, email_engagement_score, etc.)",
+                    "properties": {
+                        "website_visits_30d": {"type": "number"},
+                        "demo_requested": {"type": "boolean"},
+                        "whitepaper_downloads": {"type": "number"},
+                        "email_engagement_score": {"type": "number"},
+                        "linkedin_engagement": {"type": "boolean"},
+                        "free_trial_started": {"type": "boolean"}
+                    }
+                },
+                "industry": {
+                    "type": "string",
+                    "description": "Company industry (technology, finance, healthcare, etc.)",
+                    "default": "technology"
+                },
+                "employee_count": {
+                    "type": "number",
+                    "description": "Number of employees",
+                    "default": 100
+                }
+            },
+            "required": ["company_name", "signals"]
+        }
+    ),
+    types.Tool(
+        name="score_leads_batch",
+        description=f"Score up to {BATCH_MAX_LEADS} leads in one request. Returns company, score, and tier per lead in input order; set include_details for full attributions and explanations.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "leads": {
+                    "type": "array",
+                    "description": "Leads to score, each with the score_lead arguments",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "company_name": {"type": "string"},
+                            "signals": {"type": "object"},
+                            "industry": {"type": "string", "default": "technology"},
+                            "employee_count": {"type": "number", "default": 100}
+                        },
+                        "required": ["company_name", "signals"]
+                    }
+                },
+                "include_details": {
+                    "type": "boolean",
+                    "description": "Include feature attributions and explanations",
+                    "default": False
+                }
+            },
+            "required": ["leads"]
+        }
+    ),
+    types.Tool(
+        name="get_conversion_insights",
+        description="Analyze trial account and predict conversion probability with recommended actions.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "account_id": {
+                    "type": "string",
+                    "description": "Account ID (e.g., acc_002)"
+                }
+            },
+            "required": ["account_id"]
+        }
+    ),
+    types.Tool(
+        name="detect_churn_risk",
+        description="Analyze account health and detect churn risk with suggested interventions.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "account_id": {
+                    "type": "string",
+                    "description": "Account ID (e.g., acc_001)"
+                }
+            },
+            "required": ["account_id"]
+        }
+    ),
+    types.Tool(
+        name="check_model_health",
+        description="Check ML model health metrics, uptime, and drift status.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="log_prediction",
+        description="Log a prediction for monitoring and drift detection.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "prediction_data": {
+                    "type": "object",
+                    "description": "Prediction details including type, input, and result",
+                    "properties": {
+                        "prediction_type": {"type": "string"},
+                        "input_data": {"type": "object"},
+                        "prediction_result": {"type": "object"}
+                    },
+                    "required": ["prediction_type", "input_data", "prediction_result"]
+                }
+            },
+            "required": ["prediction_data"]
+        }
+    ),
+    types.Tool(
+        name="batch_execute",
+        description="Execute several tool calls in one request. Returns a JSON array of results in call order; a failing call yields an error entry without aborting the rest.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "description": f"Tool calls to execute (at most {BATCH_MAX_CALLS})",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "arguments": {"type": "object"}
+                        },
+                        "required": ["name"]
+                    }
+                }
+            },
+            "required": ["calls"]
+        }
+    )
+]
+
+# Tool name -> validator for its inputSchema. The SDK validates top-level
+# calls; batch_execute applies these to the calls it runs itself
+_TOOL_VALIDATORS: Dict[str, jsonschema.protocols.Validator] = {
+    tool.name: jsonschema.validators.validator_for(tool.inputSchema)(tool.inputSchema)
+    for tool in _TOOLS
+}
+
+_PROMPTS: list[types.Prompt] = [
+    types.Prompt(
+        name="analyze-account-expansion",
+        description="Template for CS team to assess upsell opportunity for an account",
+        arguments=[
+            types.PromptArgument(
+                name="account_id",
+                description="Account ID to analyze",
+                required=True
+            )
+        ]
+    ),
+    types.Prompt(
+        name="weekly-lead-report",
+        description="Template for Sales leadership pipeline quality report",
+        arguments=[
+            types.PromptArgument(
+                name="week_number",
+                description="Week number for the report",
+                required=False
+            )
+        ]
+    ),
+    types.Prompt(
+        name="explain-low-score",
+        description="Template to generate explanation for why a lead scored poorly",
+        arguments=[
+            types.PromptArgument(
+                name="lead_id",
+                description="Lead ID to explain",
+                required=True
+            )
+        ]
+    )
+]
+
+
+# (accounts snapshot, its JSON encoding) for the crm://accounts/list resource
+_accounts_json_cache: Tuple[Optional[Tuple[Dict[str, Any], ...]], str] = (None, "")
+
+
+def _accounts_list_json() -> str:
+    """
+    JSON for the crm://accounts/list resource.
+    Re-encoded only when data_store hands out a new accounts snapshot.
+    """
+    global _accounts_json_cache
+
+    accounts = get_all_accounts()
+    cached_accounts, cached_json = _accounts_json_cache
+    if accounts is not cached_accounts:
+        cached_json = _to_json(accounts)
+        _accounts_json_cache = (accounts, cached_json)
+    return cached_json
+
+
+@lru_cache(maxsize=None)
+def _model_metadata_json(drift_status: str) -> str:
+    """
+    JSON for the models://lead_scorer/metadata resource.
+    Everything but drift_status is fixed for the model version, so one
+    encoding is kept per drift status.
+    """
+    return _to_json({
+        "model_version": MODEL_VERSION,
+        "training_date": TRAINING_DATE,
+        "performance_metrics": MODEL_PERFORMANCE_METRICS,
+        "feature_importance": FEATURE_IMPORTANCE,
+        "drift_status": drift_status
+    })
 
 
 @app.list_resources()
@@ -55,20 +327,7 @@ async def list_resources() -> list[types.Resource]:
     """
     logger.info("Listing available resources")
 
-    return [
-        types.Resource(
-            uri="crm://accounts/list",
-            name="All CRM Accounts",
-            mimeType="application/json",
-            description="List of all customer accounts with usage signals"
-        ),
-        types.Resource(
-            uri="models://lead_scorer/metadata",
-            name="Lead Scorer Model Metadata",
-            mimeType="application/json",
-            description="Model version, performance metrics, and drift status"
-        )
-    ]
+    return list(_RESOURCES)
 
 
 @app.read_resource()
@@ -81,7 +340,7 @@ async def read_resource(uri: str) -> str:
     - crm://leads/{lead_id} - Get specific lead data
     - models://lead_scorer/metadata - Get model metadata
     """
-    logger.info(f"Reading resource: {uri}")
+    logger.info("Reading resource: %s", uri)
 
     # Parse URI
     if uri.startswith("crm://accounts/"):
@@ -89,16 +348,13 @@ async def read_resource(uri: str) -> str:
 
         if account_id == "list":
             # Return all accounts
-            accounts = get_all_accounts()
-            import json
-            return json.dumps(accounts, indent=2)
+            return _accounts_list_json()
 
         account = get_account(account_id)
         if not account:
             raise ValueError(f"Account not found: {account_id}")
 
-        import json
-        return json.dumps(account, indent=2)
+        return _to_json(account)
 
     elif uri.startswith("crm://leads/"):
         lead_id = uri.replace("crm://leads/", "")
@@ -106,24 +362,14 @@ async def read_resource(uri: str) -> str:
         if not lead:
             raise ValueError(f"Lead not found: {lead_id}")
 
-        import json
-        return json.dumps(lead, indent=2)
+        return _to_json(lead)
 
     elif uri == "models://lead_scorer/metadata":
         # Calculate drift status (simplified)
         prediction_count = get_prediction_count_24h()
         drift_status = "normal" if prediction_count < 1000 else "warning"
 
-        metadata = {
-            "model_version": MODEL_VERSION,
-            "training_date": TRAINING_DATE,
-            "performance_metrics": MODEL_PERFORMANCE_METRICS,
-            "feature_importance": FEATURE_IMPORTANCE,
-            "drift_status": drift_status
-        }
-
-        import json
-        return json.dumps(metadata, indent=2)
+        return _model_metadata_json(drift_status)
 
     else:
         raise ValueError(f"Unknown resource URI: {uri}")
@@ -137,244 +383,386 @@ async def list_tools() -> list[types.Tool]:
     """
     logger.info("Listing available tools")
 
-    return [
-        types.Tool(
-            name="score_lead",
-            description="Score a lead based on company attributes and engagement signals. Returns score (0-100), tier (hot/warm/cold), and feature attributions.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "company_name": {
-                        "type": "string",
-                        "description": "Name of the company"
-                    },
-                    "signals": {
-                        "type": "object",
-                        "description": "Engagement signals (website_visits_30d, demo_requested, email_engagement_score, etc.)",
-                        "properties": {
-                            "website_visits_30d": {"type": "number"},
-                            "demo_requested": {"type": "boolean"},
-                            "whitepaper_downloads": {"type": "number"},
-                            "email_engagement_score": {"type": "number"},
-                            "linkedin_engagement": {"type": "boolean"},
-                            "free_trial_started": {"type": "boolean"}
-                        }
-                    },
-                    "industry": {
-                        "type": "string",
-                        "description": "Company industry (technology, finance, healthcare, etc.)",
-                        "default": "technology"
-                    },
-                    "employee_count": {
-                        "type": "number",
-                        "description": "Number of employees",
-                        "default": 100
-                    }
-                },
-                "required": ["company_name", "signals"]
-            }
-        ),
-        types.Tool(
-            name="get_conversion_insights",
-            description="Analyze trial account and predict conversion probability with recommended actions.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "account_id": {
-                        "type": "string",
-                        "description": "Account ID (e.g., acc_002)"
-                    }
-                },
-                "required": ["account_id"]
-            }
-        ),
-        types.Tool(
-            name="detect_churn_risk",
-            description="Analyze account health and detect churn risk with suggested interventions.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "account_id": {
-                        "type": "string",
-                        "description": "Account ID (e.g., acc_001)"
-                    }
-                },
-                "required": ["account_id"]
-            }
-        ),
-        types.Tool(
-            name="check_model_health",
-            description="Check ML model health metrics, uptime, and drift status.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="log_prediction",
-            description="Log a prediction for monitoring and drift detection.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "prediction_data": {
-                        "type": "object",
-                        "description": "Prediction details including type, input, and result",
-                        "properties": {
-                            "prediction_type": {"type": "string"},
-                            "input_data": {"type": "object"},
-                            "prediction_result": {"type": "object"}
-                        },
-                        "required": ["prediction_type", "input_data", "prediction_result"]
-                    }
-                },
-                "required": ["prediction_data"]
-            }
+    return list(_TOOLS)
+
+
+def _log_prediction(
+    pending_logs: Optional[List[Dict[str, Any]]],
+    prediction_type: str,
+    input_data: Dict[str, Any],
+    prediction_result: Dict[str, Any]
+) -> None:
+    """Store a prediction log now, or queue it on pending_logs for a bulk store."""
+    if pending_logs is None:
+        store_prediction_log(
+            prediction_type=prediction_type,
+            input_data=input_data,
+            prediction_result=prediction_result,
+            model_version=MODEL_VERSION
+        )
+    else:
+        pending_logs.append({
+            "prediction_type": prediction_type,
+            "input_data": input_data,
+            "prediction_result": prediction_result,
+            "model_version": MODEL_VERSION
+        })
+
+
+def _tool_score_lead(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Score a lead and log the prediction."""
+    # Extract parameters
+    company_name = arguments["company_name"]
+    signals = arguments["signals"]
+    industry = arguments.get("industry", "technology")
+    employee_count = arguments.get("employee_count", 100)
+
+    # Score the lead
+    result = score_lead(company_name, signals, industry, employee_count)
+
+    # Log the prediction
+    _log_prediction(
+        pending_logs,
+        prediction_type="lead_score",
+        input_data={
+            "company_name": company_name,
+            "signals": signals,
+            "industry": industry,
+            "employee_count": employee_count
+        },
+        prediction_result=result
+    )
+
+    return result
+
+
+def _tool_score_leads_batch(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Score a list of leads and log the predictions in bulk."""
+    leads = arguments["leads"]
+    include_details = arguments.get("include_details", False)
+
+    if len(leads) > BATCH_MAX_LEADS:
+        raise ValueError(
+            f"Batch of {len(leads)} leads exceeds the limit of {BATCH_MAX_LEADS}"
         )
+
+    inputs = [
+        {
+            "company_name": lead["company_name"],
+            "signals": lead["signals"],
+            "industry": lead.get("industry", "technology"),
+            "employee_count": lead.get("employee_count", 100)
+        }
+        for lead in leads
     ]
 
+    results = batch_score_leads(
+        inputs,
+        include_details=include_details,
+        company_key="company_name"
+    )
+
+    # Log the predictions together
+    records = [
+        {
+            "prediction_type": "lead_score",
+            "input_data": input_data,
+            "prediction_result": result,
+            "model_version": MODEL_VERSION
+        }
+        for input_data, result in zip(inputs, results)
+    ]
+    if pending_logs is not None:
+        pending_logs.extend(records)
+    elif records:
+        store_prediction_logs_bulk(records)
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[types.TextContent]:
+    return results
+
+
+def _tool_get_conversion_insights(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Predict conversion probability for a trial account and log the prediction."""
+    account_id = arguments["account_id"]
+    account = get_account(account_id)
+
+    if not account:
+        raise ValueError(f"Account not found: {account_id}")
+
+    if account["plan"] != "trial":
+        return {
+            "error": f"Account {account_id} is not a trial account (plan: {account['plan']})"
+        }
+
+    result = calculate_conversion_probability(account)
+
+    # Log the prediction
+    _log_prediction(
+        pending_logs,
+        prediction_type="conversion_probability",
+        input_data={"account_id": account_id},
+        prediction_result=result
+    )
+
+    return result
+
+
+def _tool_detect_churn_risk(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Detect churn risk for an account and log the prediction."""
+    account_id = arguments["account_id"]
+    account = get_account(account_id)
+
+    if not account:
+        raise ValueError(f"Account not found: {account_id}")
+
+    result = detect_churn_risk(account)
+
+    # Log the prediction
+    _log_prediction(
+        pending_logs,
+        prediction_type="churn_risk",
+        input_data={"account_id": account_id},
+        prediction_result=result
+    )
+
+    return result
+
+
+def _tool_check_model_health(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Report model uptime, prediction volume, and drift status."""
+    uptime_seconds = time.monotonic() - _START_MONOTONIC
+    uptime_hours = uptime_seconds / 3600
+
+    prediction_count = get_prediction_count_24h()
+
+    # Simple drift detection (would compare distributions in production)
+    drift_detected = prediction_count > 1000  # Simplified threshold
+
+    return {
+        "model_version": MODEL_VERSION,
+        "uptime_hours": round(uptime_hours, 2),
+        "prediction_count_24h": prediction_count,
+        "drift_detected": drift_detected,
+        "accuracy_last_7d": MODEL_PERFORMANCE_METRICS["accuracy"],
+        "performance_metrics": MODEL_PERFORMANCE_METRICS,
+        "alerts": [
+            "High prediction volume - monitoring for drift"
+        ] if drift_detected else []
+    }
+
+
+def _tool_log_prediction(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Store a client-supplied prediction log; always stored immediately."""
+    prediction_data = arguments["prediction_data"]
+
+    return store_prediction_log(
+        prediction_type=prediction_data["prediction_type"],
+        input_data=prediction_data["input_data"],
+        prediction_result=prediction_data["prediction_result"],
+        model_version=MODEL_VERSION
+    )
+
+
+def _validate_arguments(name: str, arguments: Any) -> None:
     """
-    Execute a tool with the provided arguments.
+    Check tool arguments against the tool's inputSchema.
+
+    Raises:
+        ValueError: If the arguments do not match the schema
     """
-    logger.info(f"Calling tool: {name}")
+    validator = _TOOL_VALIDATORS.get(name)
+    if validator is None:
+        return
+    try:
+        validator.validate(arguments)
+    except jsonschema.ValidationError as e:
+        raise ValueError(f"Input validation error: {e.message}") from e
 
-    import json
 
-    try:
-        if name == "score_lead":
-            # Extract parameters
-            company_name = arguments["company_name"]
-            signals = arguments["signals"]
-            industry = arguments.get("industry", "technology")
-            employee_count = arguments.get("employee_count", 100)
-
-            # Score the lead
-            result = score_lead(company_name, signals, industry, employee_count)
-
-            # Log the prediction
-            store_prediction_log(
-                prediction_type="lead_score",
-                input_data={
-                    "company_name": company_name,
-                    "signals": signals,
-                    "industry": industry,
-                    "employee_count": employee_count
-                },
-                prediction_result=result,
-                model_version=MODEL_VERSION
-            )
+def _tool_batch_execute(
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Execute several tool calls in one request.
 
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
+    A failing call does not abort the batch: its slot in the returned list
+    holds an error entry instead, so results stay aligned with the calls.
+    Prediction logs from the scoring tools are stored together once the
+    batch has run.
+    """
+    calls = arguments["calls"]
+    if len(calls) > BATCH_MAX_CALLS:
+        raise ValueError(
+            f"Batch of {len(calls)} calls exceeds the limit of {BATCH_MAX_CALLS}"
+        )
 
-        elif name == "get_conversion_insights":
-            account_id = arguments["account_id"]
-            account = get_account(account_id)
+    logger.info("Executing batch of %d tool calls", len(calls))
+
+    results = []
+    batch_logs: List[Dict[str, Any]] = []
+    for call in calls:
+        name = None
+        try:
+            name = call.get("name")
+            call_arguments = call.get("arguments") or {}
+            if name == "batch_execute":
+                raise ValueError("batch_execute calls cannot be nested")
+            _validate_arguments(name, call_arguments)
+            results.append(_run_tool(name, call_arguments, batch_logs))
+        except Exception as e:
+            logger.error("Error executing batched tool %s: %s", name, e)
+            results.append({"error": str(e), "tool": name})
+
+    if batch_logs:
+        store_prediction_logs_bulk(batch_logs)
+
+    return results
+
+
+# Tool name -> handler(arguments, pending_logs)
+_TOOL_DISPATCH: Dict[str, Callable[[Any, Optional[List[Dict[str, Any]]]], Any]] = {
+    "score_lead": _tool_score_lead,
+    "score_leads_batch": _tool_score_leads_batch,
+    "get_conversion_insights": _tool_get_conversion_insights,
+    "detect_churn_risk": _tool_detect_churn_risk,
+    "check_model_health": _tool_check_model_health,
+    "log_prediction": _tool_log_prediction,
+    "batch_execute": _tool_batch_execute
+}
+
+
+def _run_tool(
+    name: str,
+    arguments: Any,
+    pending_logs: Optional[List[Dict[str, Any]]] = None
+) -> Any:
+    """
+    Execute a tool and return its JSON-serializable result.
 
-            if not account:
-                raise ValueError(f"Account not found: {account_id}")
+    Args:
+        name: Tool name
+        arguments: Tool arguments
+        pending_logs: If given, prediction logs from scoring tools are queued
+            here for the caller to store in bulk instead of being stored now
 
-            if account["plan"] != "trial":
-                return [types.TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "error": f"Account {account_id} is not a trial account (plan: {account['plan']})"
-                    }, indent=2)
-                )]
-
-            result = calculate_conversion_probability(account)
-
-            # Log the prediction
-            store_prediction_log(
-                prediction_type="conversion_probability",
-                input_data={"account_id": account_id},
-                prediction_result=result,
-                model_version=MODEL_VERSION
-            )
+    Raises:
+        ValueError: If the tool is unknown or its target record does not exist
+    """
+    handler = _TOOL_DISPATCH.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return handler(arguments, pending_logs)
 
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
 
-        elif name == "detect_churn_risk":
-            account_id = arguments["account_id"]
-            account = get_account(account_id)
+def _failure_key(name: str, arguments: Any) -> Tuple[str, bytes]:
+    """Key identifying a tool call by name and a digest of its canonicalized arguments."""
+    canonical = json.dumps(arguments, sort_keys=True, default=str)
+    return name, hashlib.blake2b(canonical.encode(), digest_size=16).digest()
 
-            if not account:
-                raise ValueError(f"Account not found: {account_id}")
 
-            result = detect_churn_risk(account)
+def _failures_tracked(now: float) -> bool:
+    """
+    Whether any failure within the loop-detection window is being tracked.
+    Clears the table once its newest failure is stale, so calls stop paying
+    for a key after the window passes.
+    """
+    if _tool_failures and now - _last_failure_time > TOOL_FAILURE_WINDOW_SECONDS:
+        _tool_failures.clear()
+    return bool(_tool_failures)
+
+
+def _recent_failures(key: Tuple[str, bytes], now: float) -> Deque[float]:
+    """Failure times for a call within the loop-detection window, oldest first."""
+    failures = _tool_failures.get(key)
+    if failures is None:
+        return deque()
+    cutoff = now - TOOL_FAILURE_WINDOW_SECONDS
+    while failures and failures[0] < cutoff:
+        failures.popleft()
+    if not failures:
+        del _tool_failures[key]
+    return failures
+
+
+def _record_failure(key: Tuple[str, bytes], now: float) -> None:
+    """Record a failed call, discarding stale entries once many keys accumulate."""
+    global _last_failure_time
+    _last_failure_time = now
+    if len(_tool_failures) >= 1024:
+        cutoff = now - TOOL_FAILURE_WINDOW_SECONDS
+        for stale in [k for k, times in _tool_failures.items() if times[-1] < cutoff]:
+            del _tool_failures[stale]
+    _tool_failures[key].append(now)
 
-            # Log the prediction
-            store_prediction_log(
-                prediction_type="churn_risk",
-                input_data={"account_id": account_id},
-                prediction_result=result,
-                model_version=MODEL_VERSION
-            )
 
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
-
-        elif name == "check_model_health":
-            uptime_seconds = (datetime.utcnow() - SERVER_START_TIME).total_seconds()
-            uptime_hours = uptime_seconds / 3600
-
-            prediction_count = get_prediction_count_24h()
-
-            # Simple drift detection (would compare distributions in production)
-            drift_detected = prediction_count > 1000  # Simplified threshold
-
-            health_status = {
-                "model_version": MODEL_VERSION,
-                "uptime_hours": round(uptime_hours, 2),
-                "prediction_count_24h": prediction_count,
-                "drift_detected": drift_detected,
-                "accuracy_last_7d": MODEL_PERFORMANCE_METRICS["accuracy"],
-                "performance_metrics": MODEL_PERFORMANCE_METRICS,
-                "alerts": [
-                    "High prediction volume - monitoring for drift"
-                ] if drift_detected else []
-            }
-
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(health_status, indent=2)
-            )]
-
-        elif name == "log_prediction":
-            prediction_data = arguments["prediction_data"]
-
-            result = store_prediction_log(
-                prediction_type=prediction_data["prediction_type"],
-                input_data=prediction_data["input_data"],
-                prediction_result=prediction_data["prediction_result"],
-                model_version=MODEL_VERSION
-            )
+@app.call_tool()
+async def call_tool(name: str, arguments: Any) -> list[types.TextContent]:
+    """
+    Execute a tool with the provided arguments.
+
+    A call that keeps failing with identical arguments (e.g. an agent retrying
+    in a loop) is refused for the rest of the failure window instead of
+    being re-run. The call's key is only computed while a failure from the
+    last window is tracked, so successful calls otherwise skip it.
+    """
+    logger.info("Calling tool: %s", name)
+
+    key = None
+    now = time.monotonic()
+    if _failures_tracked(now):
+        key = _failure_key(name, arguments)
+    if key is not None and len(_recent_failures(key, now)) >= TOOL_FAILURE_LIMIT:
+        logger.warning("Refusing repeated failing call to tool %s", name)
+        return [types.TextContent(
+            type="text",
+            text=_to_json({
+                "error": "loop_detected",
+                "detail": (
+                    f"{name} failed {TOOL_FAILURE_LIMIT} times with these arguments "
+                    f"in the last {TOOL_FAILURE_WINDOW_SECONDS} seconds"
+                ),
+                "tool": name,
+                "retry_after": TOOL_FAILURE_WINDOW_SECONDS
+            })
+        )]
 
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
+    try:
+        result = _run_tool(name, arguments)
+        if key is not None:
+            _tool_failures.pop(key, None)
 
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+        return [types.TextContent(
+            type="text",
+            text=_to_json(result)
+        )]
 
     except Exception as e:
-        logger.error(f"Error executing tool {name}: {str(e)}")
+        logger.error("Error executing tool %s: %s", name, e)
+        _record_failure(key or _failure_key(name, arguments), now)
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_to_json({
                 "error": str(e),
                 "tool": name
-            }, indent=2)
+            })
         )]
 
 
@@ -385,41 +773,56 @@ async def list_prompts() -> list[types.Prompt]:
     """
     logger.info("Listing available prompts")
 
-    return [
-        types.Prompt(
-            name="analyze-account-expansion",
-            description="Template for CS team to assess upsell opportunity for an account",
-            arguments=[
-                types.PromptArgument(
-                    name="account_id",
-                    description="Account ID to analyze",
-                    required=True
-                )
-            ]
-        ),
-        types.Prompt(
-            name="weekly-lead-report",
-            description="Template for Sales leadership pipeline quality report",
-            arguments=[
-                types.PromptArgument(
-                    name="week_number",
-                    description="Week number for the report",
-                    required=False
-                )
-            ]
-        ),
-        types.Prompt(
-            name="explain-low-score",
-            description="Template to generate explanation for why a lead scored poorly",
-            arguments=[
-                types.PromptArgument(
-                    name="lead_id",
-                    description="Lead ID to explain",
-                    required=True
+    return list(_PROMPTS)
+
+
+@lru_cache(maxsize=64)
+def _weekly_lead_report_prompt(week_number: str) -> types.GetPromptResult:
+    """
+    Render the weekly-lead-report prompt.
+    The prompt depends only on the week number, so renders are reused.
+    """
+    prompt_text = f"""# Weekly Lead Quality Report - Week {week_number}
+
+## Task
+Generate a leadership summary of lead pipeline quality including:
+
+1. **Lead Volume & Velocity**
+   - Total new leads this week
+   - Hot/Warm/Cold distribution
+   - Week-over-week trend
+
+2. **Quality Metrics**
+   - Average lead score
+   - Demo request rate
+   - Trial start rate
+   - Top performing industries
+
+3. **Pipeline Health**
+   - High-value opportunities (enterprise leads scoring >80)
+   - At-risk leads (engaged but not converting)
+   - Recommended focus areas
+
+4. **Action Items**
+   - Leads requiring immediate follow-up
+   - Campaigns to optimize
+   - Resource allocation recommendations
+
+Please analyze the lead data and provide a concise executive summary.
+"""
+
+    return types.GetPromptResult(
+        description=f"Weekly lead pipeline quality report for week {week_number}",
+        messages=[
+            types.PromptMessage(
+                role="user",
+                content=types.TextContent(
+                    type="text",
+                    text=prompt_text
                 )
-            ]
-        )
-    ]
+            )
+        ]
+    )
 
 
 @app.get_prompt()
@@ -427,7 +830,7 @@ async def get_prompt(name: str, arguments: dict[str, str] | None) -> types.GetPr
     """
     Get a specific prompt template with arguments filled in.
     """
-    logger.info(f"Getting prompt: {name}")
+    logger.info("Getting prompt: %s", name)
 
     if name == "analyze-account-expansion":
         account_id = arguments.get("account_id", "acc_001") if arguments else "acc_001"
@@ -470,48 +873,7 @@ Please provide a structured analysis with specific recommendations.
 
     elif name == "weekly-lead-report":
         week_number = arguments.get("week_number", "45") if arguments else "45"
-
-        prompt_text = f"""# Weekly Lead Quality Report - Week {week_number}
-
-## Task
-Generate a leadership summary of lead pipeline quality including:
-
-1. **Lead Volume & Velocity**
-   - Total new leads this week
-   - Hot/Warm/Cold distribution
-   - Week-over-week trend
-
-2. **Quality Metrics**
-   - Average lead score
-   - Demo request rate
-   - Trial start rate
-   - Top performing industries
-
-3. **Pipeline Health**
-   - High-value opportunities (enterprise leads scoring >80)
-   - At-risk leads (engaged but not converting)
-   - Recommended focus areas
-
-4. **Action Items**
-   - Leads requiring immediate follow-up
-   - Campaigns to optimize
-   - Resource allocation recommendations
-
-Please analyze the lead data and provide a concise executive summary.
-"""
-
-        return types.GetPromptResult(
-            description=f"Weekly lead pipeline quality report for week {week_number}",
-            messages=[
-                types.PromptMessage(
-                    role="user",
-                    content=types.TextContent(
-                        type="text",
-                        text=prompt_text
-                    )
-                )
-            ]
-        )
+        return _weekly_lead_report_prompt(week_number)
 
     elif name == "explain-low-score":
         lead_id = arguments.get("lead_id", "lead_001") if arguments else "lead_001"
@@ -576,7 +938,10 @@ Provide a structured analysis with specific, actionable recommendations.
 
 async def main():
     """Run the MCP server."""
-    logger.info(f"Starting Revenue Intelligence MCP Server (Model: {MODEL_VERSION})")
+    logger.info(
+        "Starting Revenue Intelligence MCP Server (Model: %s, started: %sZ)",
+        MODEL_VERSION, SERVER_START_TIME.isoformat()
+    )
 
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
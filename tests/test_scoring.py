@@ -5,12 +5,20 @@ Tests for scoring logic.
 import pytest
 from scoring import (
     score_lead,
+    batch_score_leads,
     detect_churn_risk,
+    batch_detect_churn_risk,
     calculate_conversion_probability,
     calculate_engagement_score,
     calculate_intent_score
 )
-from config import MODEL_VERSION
+from config import (
+    MODEL_VERSION,
+    LEAD_TIERS_SORTED,
+    CHURN_RISK_TIERS_SORTED,
+    get_company_size_score,
+    tier_for_score
+)
 
 
 class TestLeadScoring:
@@ -134,6 +142,107 @@ class TestLeadScoring:
         assert "HighValue Corp" in result["explanation"]
 
 
+class TestBatchLeadScoring:
+    """Test batch lead scoring."""
+
+    def test_batch_score_leads_matches_single(self):
+        """Test that batch scores match one-at-a-time scoring, in order."""
+        from mock_data import LEADS
+
+        results = batch_score_leads(LEADS, include_details=True)
+
+        assert len(results) == len(LEADS)
+        for lead, result in zip(LEADS, results):
+            single = score_lead(
+                company_name=lead["company"],
+                signals=lead["signals"],
+                industry=lead["industry"],
+                employee_count=lead["employee_count"]
+            )
+            assert result["score"] == single["score"]
+            assert result["tier"] == single["tier"]
+
+    def test_batch_score_leads_summary_matches_details(self):
+        """Test that the score-only path agrees with full scoring."""
+        from mock_data import LEADS
+
+        detailed = batch_score_leads(LEADS, include_details=True)
+        summary = batch_score_leads(LEADS)
+
+        for lead, full, short in zip(LEADS, detailed, summary):
+            assert short == {
+                "company": lead["company"],
+                "score": full["score"],
+                "tier": full["tier"]
+            }
+
+    def test_batch_score_leads_company_key(self):
+        """Test that score_lead-shaped leads are read via company_key."""
+        from mock_data import LEADS
+
+        leads = LEADS[:3]
+        renamed = [
+            {
+                "company_name": lead["company"],
+                "signals": lead["signals"],
+                "industry": lead["industry"],
+                "employee_count": lead["employee_count"]
+            }
+            for lead in leads
+        ]
+
+        assert batch_score_leads(renamed, company_key="company_name") == batch_score_leads(leads)
+
+    def test_batch_score_leads_empty(self):
+        """Test that an empty batch returns no results."""
+        assert batch_score_leads([]) == []
+
+
+class TestTimestamps:
+    """Test result timestamps."""
+
+    def test_result_timestamp_is_iso_utc(self):
+        """Test that results carry an ISO 8601 UTC timestamp."""
+        from datetime import datetime, timezone
+
+        result = score_lead(company_name="Test Corp", signals={})
+        timestamp = result["timestamp"]
+
+        assert timestamp.endswith("Z")
+        parsed = datetime.fromisoformat(timestamp[:-1]).replace(tzinfo=timezone.utc)
+        assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 60
+
+
+class TestTierLookup:
+    """Test threshold-to-tier lookup."""
+
+    def test_tier_for_score_boundaries(self):
+        """Test that tier thresholds are inclusive lower bounds."""
+        assert tier_for_score(70, LEAD_TIERS_SORTED) == "hot"
+        assert tier_for_score(69.99, LEAD_TIERS_SORTED) == "warm"
+        assert tier_for_score(40, LEAD_TIERS_SORTED) == "warm"
+        assert tier_for_score(0, LEAD_TIERS_SORTED) == "cold"
+
+    def test_tier_for_score_churn(self):
+        """Test churn risk tiers."""
+        assert tier_for_score(85, CHURN_RISK_TIERS_SORTED) == "critical"
+        assert tier_for_score(50, CHURN_RISK_TIERS_SORTED) == "high"
+        assert tier_for_score(30, CHURN_RISK_TIERS_SORTED) == "medium"
+        assert tier_for_score(10, CHURN_RISK_TIERS_SORTED) == "low"
+
+    def test_company_size_score_buckets(self):
+        """Test company size buckets, including fractional counts."""
+        assert get_company_size_score(10) == 30
+        assert get_company_size_score(19.5) == 30
+        assert get_company_size_score(20) == 50
+        assert get_company_size_score(1000) == 100
+
+    def test_company_size_score_rejects_non_numbers(self):
+        """Test that malformed employee counts fail with a clear error."""
+        with pytest.raises(TypeError, match="employee_count must be a number"):
+            get_company_size_score([100])
+
+
 class TestEngagementScoring:
     """Test engagement score calculation."""
 
@@ -235,6 +344,46 @@ class TestChurnDetection:
         assert "suggested_interventions" in result
         assert len(result["suggested_interventions"]) > 0
 
+    def test_detect_churn_risk_interventions_unique_and_ordered(self):
+        """Test that each intervention is suggested once, in a fixed order."""
+        account = {
+            "id": "acc_test",
+            "company": "NeedsHelp Co",
+            "plan": "starter",
+            "usage_signals": {
+                "daily_active_users": 4,
+                "features_adopted": 1,
+                "support_tickets_30d": 6,
+                "nps_score": 4,
+                "login_frequency_7d": 3
+            }
+        }
+
+        result = detect_churn_risk(account)
+
+        assert result["suggested_interventions"] == [
+            "Schedule executive business review to address concerns",
+            "Provide personalized onboarding/training session",
+            "Demonstrate advanced features relevant to their use case",
+            "Explore upsell to Professional tier with more features"
+        ]
+
+
+class TestBatchChurnDetection:
+    """Test batch churn risk detection."""
+
+    def test_batch_detect_churn_risk_matches_single(self):
+        """Test that batch results match one-at-a-time detection, in order."""
+        from mock_data import ACCOUNTS
+
+        results = batch_detect_churn_risk(ACCOUNTS)
+
+        assert [r["account_id"] for r in results] == [a["id"] for a in ACCOUNTS]
+        for account, result in zip(ACCOUNTS, results):
+            single = detect_churn_risk(account)
+            assert result["risk_score"] == single["risk_score"]
+            assert result["risk_tier"] == single["risk_tier"]
+
 
 class TestConversionProbability:
     """Test conversion probability calculation."""
@@ -2,17 +2,84 @@
 Tests for MCP tools and data access.
 """
 
+import json
+from collections import defaultdict, deque
+
 import pytest
 from data_store import (
     get_account,
     get_lead,
     store_prediction_log,
+    store_prediction_logs_bulk,
     get_prediction_logs,
     get_prediction_count_24h,
-    get_accounts_by_status
+    get_accounts_by_status,
+    get_accounts_by_industry,
+    get_accounts_by_industry_and_plan,
+    get_leads_by_industry,
+    clear_prediction_logs
+)
+from mock_data import (
+    ACCOUNTS,
+    LEADS,
+    ACCOUNTS_BY_ID,
+    LEADS_BY_ID,
+    ACCOUNT_STATUSES,
+    ACCOUNT_PLANS,
+    PREDICTION_LOGS
 )
-from mock_data import ACCOUNTS, LEADS, PREDICTION_LOGS
 from config import MODEL_VERSION
+from models import UsageSignals, LeadSignals, PredictionLog
+from scoring import score_lead, detect_churn_risk, calculate_conversion_probability
+from server import call_tool, read_resource
+
+# Fields every mock record must carry
+REQUIRED_ACCOUNT_FIELDS = frozenset(
+    ["id", "company", "plan", "mrr", "created_date", "usage_signals"]
+)
+REQUIRED_LEAD_FIELDS = frozenset(["id", "company", "industry", "employee_count", "signals"])
+EXPECTED_USAGE_SIGNALS = frozenset(["daily_active_users", "features_adopted", "api_calls_per_day"])
+EXPECTED_LEAD_SIGNALS = frozenset(["website_visits_30d", "demo_requested", "email_engagement_score"])
+
+
+@pytest.fixture(autouse=True)
+def fresh_prediction_logs():
+    """Start and end every test with an empty prediction log store and indexes."""
+    clear_prediction_logs()
+    yield PREDICTION_LOGS
+    clear_prediction_logs()
+
+
+@pytest.fixture(scope="module")
+def at_risk_account():
+    """First at-risk mock account."""
+    accounts = get_accounts_by_status("at_risk")
+    assert accounts, "mock data has no at_risk accounts"
+    return accounts[0]
+
+
+@pytest.fixture(scope="module")
+def trial_account():
+    """First trial mock account."""
+    accounts = get_accounts_by_status("trial")
+    assert accounts, "mock data has no trial accounts"
+    return accounts[0]
+
+
+@pytest.fixture
+def populate_logs():
+    """Factory storing n lead_score logs with input_data {"test": i}."""
+    def _populate(n):
+        store_prediction_logs_bulk([
+            {
+                "prediction_type": "lead_score",
+                "input_data": {"test": i},
+                "prediction_result": {"score": i},
+                "model_version": MODEL_VERSION
+            }
+            for i in range(n)
+        ])
+    return _populate
 
 
 class TestDataAccess:
@@ -52,27 +119,60 @@ class TestDataAccess:
         """Test filtering accounts by status."""
         active_accounts = get_accounts_by_status("active")
 
-        assert len(active_accounts) > 0
-        for account in active_accounts:
-            assert account["status"] == "active"
+        assert active_accounts and all(
+            account["status"] == "active" for account in active_accounts
+        )
+
+    def test_get_accounts_by_status_is_immutable(self):
+        """Test that status lookups hand out tuples callers cannot corrupt."""
+        active_accounts = get_accounts_by_status("active")
+
+        assert isinstance(active_accounts, tuple)
+        assert get_accounts_by_status("active") == active_accounts
+        assert get_accounts_by_status("no_such_status") == ()
 
     def test_get_accounts_by_status_trial(self):
         """Test filtering trial accounts."""
         trial_accounts = get_accounts_by_status("trial")
 
-        assert len(trial_accounts) > 0
-        for account in trial_accounts:
-            assert account["status"] == "trial"
-            assert account["plan"] == "trial"
+        assert trial_accounts and all(
+            account["status"] == "trial" and account["plan"] == "trial"
+            for account in trial_accounts
+        )
+
+    def test_get_accounts_by_industry(self):
+        """Test filtering accounts by industry."""
+        finance_accounts = get_accounts_by_industry("finance")
+
+        assert finance_accounts and all(
+            account["industry"] == "finance" for account in finance_accounts
+        )
+        assert get_accounts_by_industry("unknown_industry_xyz") == ()
+        assert get_leads_by_industry("unknown_industry_xyz") == ()
+
+    def test_get_accounts_by_industry_and_plan(self):
+        """Test the industry x plan cross-tab matches a full scan."""
+        for account in ACCOUNTS:
+            industry, plan = account["industry"], account["plan"]
+            expected = [
+                acc for acc in ACCOUNTS
+                if acc["industry"] == industry and acc["plan"] == plan
+            ]
+            assert get_accounts_by_industry_and_plan(industry, plan) == tuple(expected)
+
+        assert get_accounts_by_industry_and_plan("finance", "no_such_plan") == ()
+
+    def test_get_leads_by_industry(self):
+        """Test filtering leads by industry."""
+        expected = [lead for lead in LEADS if lead["industry"] == "technology"]
+
+        assert len(expected) > 0
+        assert get_leads_by_industry("technology") == tuple(expected)
 
 
 class TestPredictionLogging:
     """Test prediction logging functionality."""
 
-    def setup_method(self):
-        """Clear prediction logs before each test."""
-        PREDICTION_LOGS.clear()
-
     def test_store_prediction_log(self):
         """Test storing a prediction log."""
         input_data = {
@@ -99,42 +199,57 @@ class TestPredictionLogging:
         assert len(PREDICTION_LOGS) == 1
         assert PREDICTION_LOGS[0]["prediction_type"] == "lead_score"
 
-    def test_get_prediction_logs(self):
-        """Test retrieving prediction logs."""
-        # Store some logs
-        for i in range(5):
-            store_prediction_log(
-                prediction_type="lead_score",
-                input_data={"test": i},
-                prediction_result={"score": i * 10},
-                model_version=MODEL_VERSION
-            )
+        # Stored entries match the PredictionLog schema
+        log = PredictionLog(**get_prediction_logs()[0])
+        assert log.log_id == result["log_id"]
+        assert log.timestamp == result["timestamp"]
+
+    def test_store_prediction_logs_bulk(self):
+        """Test storing several prediction logs at once."""
+        records = [
+            {
+                "prediction_type": prediction_type,
+                "input_data": {"test": i},
+                "prediction_result": {"score": i * 10},
+                "model_version": MODEL_VERSION
+            }
+            for i, prediction_type in enumerate(["lead_score", "churn_risk", "lead_score"])
+        ]
+
+        results = store_prediction_logs_bulk(records)
+
+        assert len(results) == 3
+        assert all(r["stored_successfully"] for r in results)
+        assert len({r["log_id"] for r in results}) == 3
+        assert [log["input_data"]["test"] for log in PREDICTION_LOGS] == [0, 1, 2]
+        assert len(get_prediction_logs(prediction_type="lead_score")) == 2
+        assert get_prediction_count_24h() == 3
+
+    @pytest.mark.parametrize("stored, kwargs, expected", [
+        (5, {}, 5),
+        (20, {"limit": 10}, 10),
+        (5, {"limit": 0}, 0)
+    ], ids=["all", "limit", "zero-limit"])
+    def test_get_prediction_logs(self, populate_logs, stored, kwargs, expected):
+        """Test retrieving prediction logs, with and without a limit."""
+        populate_logs(stored)
 
-        logs = get_prediction_logs()
+        logs = get_prediction_logs(**kwargs)
 
-        assert len(logs) == 5
+        assert len(logs) == expected
 
     def test_get_prediction_logs_filtered(self):
         """Test retrieving filtered prediction logs."""
         # Store different types
-        store_prediction_log(
-            prediction_type="lead_score",
-            input_data={},
-            prediction_result={},
-            model_version=MODEL_VERSION
-        )
-        store_prediction_log(
-            prediction_type="churn_risk",
-            input_data={},
-            prediction_result={},
-            model_version=MODEL_VERSION
-        )
-        store_prediction_log(
-            prediction_type="lead_score",
-            input_data={},
-            prediction_result={},
-            model_version=MODEL_VERSION
-        )
+        store_prediction_logs_bulk([
+            {
+                "prediction_type": prediction_type,
+                "input_data": {},
+                "prediction_result": {},
+                "model_version": MODEL_VERSION
+            }
+            for prediction_type in ("lead_score", "churn_risk", "lead_score")
+        ])
 
         lead_logs = get_prediction_logs(prediction_type="lead_score")
 
@@ -142,83 +257,140 @@ class TestPredictionLogging:
         for log in lead_logs:
             assert log["prediction_type"] == "lead_score"
 
-    def test_get_prediction_logs_limit(self):
-        """Test pagination/limiting of prediction logs."""
-        # Store many logs
-        for i in range(20):
+    def test_get_prediction_logs_most_recent_first(self):
+        """Test that logs are returned newest first for each filter."""
+        for i in range(4):
             store_prediction_log(
-                prediction_type="lead_score",
+                prediction_type="lead_score" if i % 2 == 0 else "churn_risk",
                 input_data={"test": i},
                 prediction_result={"score": i},
                 model_version=MODEL_VERSION
             )
 
-        logs = get_prediction_logs(limit=10)
+        all_logs = get_prediction_logs()
+        lead_logs = get_prediction_logs(prediction_type="lead_score", limit=1)
 
-        assert len(logs) == 10
+        assert [log["input_data"]["test"] for log in all_logs] == [3, 2, 1, 0]
+        assert [log["input_data"]["test"] for log in lead_logs] == [2]
 
-    def test_get_prediction_count_24h(self):
+    def test_get_prediction_count_24h(self, populate_logs):
         """Test getting prediction count."""
-        # Clear and add some logs
-        PREDICTION_LOGS.clear()
+        populate_logs(7)
+
+        count = get_prediction_count_24h()
+
+        assert count == 7
+
+    def test_get_prediction_count_24h_excludes_old_logs(self, monkeypatch):
+        """Test that logs older than 24 hours are not counted."""
+        import time
 
-        for i in range(7):
+        now = time.time()
+        for age_hours in (48, 24.5, 23.5, 0):
+            monkeypatch.setattr(time, "time", lambda: now - age_hours * 3600)
             store_prediction_log(
                 prediction_type="lead_score",
+                input_data={},
+                prediction_result={},
+                model_version=MODEL_VERSION
+            )
+
+        monkeypatch.setattr(time, "time", lambda: now)
+
+        assert get_prediction_count_24h() == 2
+        assert len(get_prediction_logs()) == 4
+
+    def test_store_prediction_log_evicts_oldest_at_capacity(self, monkeypatch):
+        """Test that the log store stays bounded and indexes stay in sync."""
+        import data_store
+
+        monkeypatch.setattr(data_store, "PREDICTION_LOG_CAPACITY", 3)
+
+        for i in range(5):
+            store_prediction_log(
+                prediction_type="lead_score" if i < 2 else "churn_risk",
                 input_data={"test": i},
                 prediction_result={"score": i},
                 model_version=MODEL_VERSION
             )
 
-        count = get_prediction_count_24h()
+        assert len(PREDICTION_LOGS) == 3
+        assert [log["input_data"]["test"] for log in get_prediction_logs()] == [4, 3, 2]
+        assert get_prediction_logs(prediction_type="lead_score") == []
+        assert len(get_prediction_logs(prediction_type="churn_risk")) == 3
+        assert get_prediction_count_24h() == 3
 
-        assert count == 7
+    def test_store_prediction_log_rejects_non_string_type(self):
+        """Test that a bad prediction type leaves the store and indexes untouched."""
+        with pytest.raises(TypeError):
+            store_prediction_log(
+                prediction_type=["lead_score"],
+                input_data={},
+                prediction_result={},
+                model_version=MODEL_VERSION
+            )
+        with pytest.raises(TypeError):
+            store_prediction_logs_bulk([
+                {
+                    "prediction_type": prediction_type,
+                    "input_data": {},
+                    "prediction_result": {},
+                    "model_version": MODEL_VERSION
+                }
+                for prediction_type in ("lead_score", ["churn_risk"])
+            ])
+
+        assert get_prediction_logs() == []
+        assert get_prediction_count_24h() == 0
+
+    def test_evicting_last_log_of_a_type_drops_its_index(self, monkeypatch):
+        """Test that the type index does not outgrow the bounded log store."""
+        import data_store
+
+        monkeypatch.setattr(data_store, "PREDICTION_LOG_CAPACITY", 3)
+
+        for i in range(10):
+            store_prediction_log(
+                prediction_type=f"custom_type_{i}",
+                input_data={},
+                prediction_result={},
+                model_version=MODEL_VERSION
+            )
+
+        assert len(PREDICTION_LOGS) == 3
+        assert sorted(data_store._LOGS_BY_TYPE) == [
+            "custom_type_7", "custom_type_8", "custom_type_9"
+        ]
 
 
 class TestMockData:
     """Test mock data integrity."""
 
-    def test_accounts_have_required_fields(self):
-        """Test that all accounts have required fields."""
-        required_fields = ["id", "company", "plan", "mrr", "created_date", "usage_signals"]
+    @pytest.mark.parametrize("account", ACCOUNTS, ids=lambda account: account["id"])
+    def test_accounts_have_required_fields(self, account):
+        """Test that every account has required fields."""
+        missing = REQUIRED_ACCOUNT_FIELDS - account.keys()
 
-        for account in ACCOUNTS:
-            for field in required_fields:
-                assert field in account, f"Account {account.get('id')} missing {field}"
+        assert not missing, f"Account {account.get('id')} missing {sorted(missing)}"
 
-    def test_leads_have_required_fields(self):
-        """Test that all leads have required fields."""
-        required_fields = ["id", "company", "industry", "employee_count", "signals"]
+    @pytest.mark.parametrize("lead", LEADS, ids=lambda lead: lead["id"])
+    def test_leads_have_required_fields(self, lead):
+        """Test that every lead has required fields."""
+        missing = REQUIRED_LEAD_FIELDS - lead.keys()
 
-        for lead in LEADS:
-            for field in required_fields:
-                assert field in lead, f"Lead {lead.get('id')} missing {field}"
+        assert not missing, f"Lead {lead.get('id')} missing {sorted(missing)}"
 
     def test_account_usage_signals_structure(self):
         """Test that usage signals have expected structure."""
-        expected_signals = [
-            "daily_active_users",
-            "features_adopted",
-            "api_calls_per_day"
-        ]
-
         for account in ACCOUNTS:
-            usage = account["usage_signals"]
-            for signal in expected_signals:
-                assert signal in usage, f"Account {account['id']} missing signal {signal}"
+            missing = EXPECTED_USAGE_SIGNALS - account["usage_signals"].keys()
+            assert not missing, f"Account {account['id']} missing signals {sorted(missing)}"
 
     def test_lead_signals_structure(self):
         """Test that lead signals have expected structure."""
-        expected_signals = [
-            "website_visits_30d",
-            "demo_requested",
-            "email_engagement_score"
-        ]
-
         for lead in LEADS:
-            signals = lead["signals"]
-            for signal in expected_signals:
-                assert signal in signals, f"Lead {lead['id']} missing signal {signal}"
+            missing = EXPECTED_LEAD_SIGNALS - lead["signals"].keys()
+            assert not missing, f"Lead {lead['id']} missing signals {sorted(missing)}"
 
     def test_accounts_count(self):
         """Test that we have expected number of accounts."""
@@ -228,35 +400,86 @@ class TestMockData:
         """Test that we have expected number of leads."""
         assert len(LEADS) == 30
 
+    def test_id_indexes_cover_all_records(self):
+        """Test that id indexes map every id to its record."""
+        assert len(ACCOUNTS_BY_ID) == len(ACCOUNTS)
+        assert len(LEADS_BY_ID) == len(LEADS)
+        for account in ACCOUNTS:
+            assert ACCOUNTS_BY_ID[account["id"]] is account
+        for lead in LEADS:
+            assert LEADS_BY_ID[lead["id"]] is lead
+
     def test_account_status_variety(self):
         """Test that we have variety in account statuses."""
-        statuses = set(account["status"] for account in ACCOUNTS)
+        statuses = ACCOUNT_STATUSES
 
         assert "active" in statuses
         assert "trial" in statuses
         assert "at_risk" in statuses
+        assert statuses == {account["status"] for account in ACCOUNTS}
 
     def test_account_plan_variety(self):
         """Test that we have variety in account plans."""
-        plans = set(account["plan"] for account in ACCOUNTS)
+        plans = ACCOUNT_PLANS
 
         assert "starter" in plans
         assert "professional" in plans
         assert "enterprise" in plans
         assert "trial" in plans
+        assert plans == {account["plan"] for account in ACCOUNTS}
+
+
+class TestModels:
+    """Test model invariants."""
+
+    def test_usage_signals_valid(self):
+        """Test that valid usage signals construct."""
+        usage = UsageSignals(
+            daily_active_users=10,
+            features_adopted=3,
+            api_calls_per_day=100,
+            nps_score=7
+        )
+
+        assert usage.nps_score == 7
+
+    def test_usage_signals_rejects_out_of_range_nps(self):
+        """Test that NPS outside 0-10 is rejected."""
+        with pytest.raises(ValueError):
+            UsageSignals(
+                daily_active_users=10,
+                features_adopted=3,
+                api_calls_per_day=100,
+                nps_score=11
+            )
+
+    def test_lead_signals_rejects_out_of_range_engagement(self):
+        """Test that email engagement outside 0-100 is rejected."""
+        with pytest.raises(ValueError):
+            LeadSignals(
+                website_visits_30d=5,
+                demo_requested=False,
+                whitepaper_downloads=0,
+                email_engagement_score=150
+            )
+
+    def test_to_dict_single_field_model(self):
+        """Test that a one-field dataclass converts to a one-key dictionary."""
+        from dataclasses import dataclass
+        from models import _to_dict
+
+        @dataclass(slots=True, frozen=True)
+        class Single:
+            name: str
+
+        assert _to_dict(Single(name="acc_001")) == {"name": "acc_001"}
 
 
 class TestIntegration:
     """Integration tests combining multiple components."""
 
-    def setup_method(self):
-        """Clear prediction logs before each test."""
-        PREDICTION_LOGS.clear()
-
     def test_score_and_log_lead(self):
         """Test scoring a lead and logging the prediction."""
-        from scoring import score_lead
-
         # Get a lead from mock data
         lead = get_lead("lead_003")
         assert lead is not None
@@ -283,32 +506,187 @@ class TestIntegration:
         assert log_result["stored_successfully"] is True
         assert len(PREDICTION_LOGS) == 1
 
-    def test_churn_detection_on_real_account(self):
+    def test_churn_detection_on_real_account(self, at_risk_account):
         """Test churn detection on actual mock account."""
-        from scoring import detect_churn_risk
-
-        # Get an at-risk account
-        at_risk_accounts = get_accounts_by_status("at_risk")
-        assert len(at_risk_accounts) > 0
-
-        account = at_risk_accounts[0]
-        result = detect_churn_risk(account)
+        result = detect_churn_risk(at_risk_account)
 
         # At-risk accounts should have elevated risk scores
         assert result["risk_score"] > 0
         assert len(result["declining_signals"]) > 0
 
-    def test_conversion_probability_on_trial(self):
+    def test_conversion_probability_on_trial(self, trial_account):
         """Test conversion probability on trial account."""
-        from scoring import calculate_conversion_probability
-
-        # Get a trial account
-        trial_accounts = get_accounts_by_status("trial")
-        assert len(trial_accounts) > 0
-
-        account = trial_accounts[0]
-        result = calculate_conversion_probability(account)
+        result = calculate_conversion_probability(trial_account)
 
         assert "conversion_probability" in result
         assert 0 <= result["conversion_probability"] <= 1
         assert "recommended_actions" in result
+
+
+class TestBatchExecute:
+    """Test the batch_execute MCP tool."""
+
+    async def test_batch_execute_results_in_call_order(self):
+        """Test that batched results come back in call order and are logged."""
+        response = await call_tool("batch_execute", {
+            "calls": [
+                {"name": "detect_churn_risk", "arguments": {"account_id": "acc_001"}},
+                {"name": "detect_churn_risk", "arguments": {"account_id": "acc_003"}}
+            ]
+        })
+        results = json.loads(response[0].text)
+
+        assert [r["account_id"] for r in results] == ["acc_001", "acc_003"]
+        assert len(PREDICTION_LOGS) == 2
+
+    async def test_batch_execute_isolates_failures(self):
+        """Test that a failing call yields an error entry without aborting the batch."""
+        response = await call_tool("batch_execute", {
+            "calls": [
+                {"name": "detect_churn_risk", "arguments": {"account_id": "acc_999"}},
+                {"name": "batch_execute", "arguments": {"calls": []}},
+                {"name": "detect_churn_risk", "arguments": {"account_id": "acc_001"}}
+            ]
+        })
+        results = json.loads(response[0].text)
+
+        assert "error" in results[0]
+        assert "error" in results[1]
+        assert results[2]["account_id"] == "acc_001"
+
+    async def test_batch_execute_validates_nested_arguments(self):
+        """Test that nested calls are checked against their tool's inputSchema."""
+        response = await call_tool("batch_execute", {
+            "calls": [
+                {
+                    "name": "log_prediction",
+                    "arguments": {
+                        "prediction_data": {
+                            "prediction_type": ["lead_score"],
+                            "input_data": {},
+                            "prediction_result": {}
+                        }
+                    }
+                },
+                "not a call",
+                {"name": "detect_churn_risk", "arguments": {}}
+            ]
+        })
+        results = json.loads(response[0].text)
+
+        assert len(results) == 3
+        assert all("error" in result for result in results)
+        assert results[0]["error"].startswith("Input validation error")
+        assert get_prediction_logs() == []
+
+
+class TestResources:
+    """Test MCP resource reads."""
+
+    async def test_accounts_list_resource(self):
+        """Test that the accounts list resource encodes every account, and is reused."""
+        first = await read_resource("crm://accounts/list")
+        second = await read_resource("crm://accounts/list")
+
+        assert json.loads(first) == ACCOUNTS
+        assert second is first
+
+    async def test_model_metadata_resource(self):
+        """Test that the metadata resource reports the model version and drift status."""
+        metadata = json.loads(await read_resource("models://lead_scorer/metadata"))
+
+        assert metadata["model_version"] == MODEL_VERSION
+        assert metadata["drift_status"] == "normal"
+
+
+class TestScoreLeadsBatch:
+    """Test the score_leads_batch MCP tool."""
+
+    async def test_score_leads_batch_matches_single_scores(self):
+        """Test that batch scores match score_lead, in input order, and are logged."""
+        leads = [
+            {
+                "company_name": lead["company"],
+                "signals": lead["signals"],
+                "industry": lead["industry"],
+                "employee_count": lead["employee_count"]
+            }
+            for lead in LEADS[:5]
+        ]
+
+        response = await call_tool("score_leads_batch", {"leads": leads})
+        results = json.loads(response[0].text)
+
+        assert [r["company"] for r in results] == [lead["company_name"] for lead in leads]
+        for lead, result in zip(leads, results):
+            single = score_lead(**lead)
+            assert result["score"] == single["score"]
+            assert result["tier"] == single["tier"]
+        assert len(get_prediction_logs(prediction_type="lead_score")) == 5
+
+
+class TestLoopDetection:
+    """Test refusal of repeatedly failing tool calls."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_tool_failures(self, monkeypatch):
+        """Track failures in a fresh table so no state outlives the test."""
+        import server
+
+        monkeypatch.setattr(server, "_tool_failures", defaultdict(deque))
+        monkeypatch.setattr(server, "_last_failure_time", 0.0)
+        return server._tool_failures
+
+    async def test_repeated_failures_are_refused(self):
+        """Test that identical failing calls are refused after the failure limit."""
+        from config import TOOL_FAILURE_LIMIT
+
+        arguments = {"account_id": "acc_loop_test"}
+        for _ in range(TOOL_FAILURE_LIMIT):
+            response = await call_tool("detect_churn_risk", arguments)
+            assert "not found" in json.loads(response[0].text)["error"]
+
+        response = await call_tool("detect_churn_risk", arguments)
+        assert json.loads(response[0].text)["error"] == "loop_detected"
+
+        # Other arguments are unaffected
+        response = await call_tool("detect_churn_risk", {"account_id": "acc_001"})
+        assert json.loads(response[0].text)["account_id"] == "acc_001"
+
+    async def test_failures_are_tracked_per_call(self, fresh_tool_failures):
+        """Test that only the failing call is tracked, not the calls that succeed."""
+        await call_tool("detect_churn_risk", {"account_id": "acc_loop_test"})
+        assert len(fresh_tool_failures) == 1
+
+        await call_tool("detect_churn_risk", {"account_id": "acc_001"})
+        assert len(fresh_tool_failures) == 1
+
+        await call_tool("check_model_health", {})
+        assert len(fresh_tool_failures) == 1
+
+    async def test_stale_failures_stop_keying_calls(self, fresh_tool_failures, monkeypatch):
+        """Test that once the window passes, successful calls skip the failure key."""
+        import time
+        import server
+        from config import TOOL_FAILURE_WINDOW_SECONDS
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        await call_tool("detect_churn_risk", {"account_id": "acc_loop_test"})
+        assert len(fresh_tool_failures) == 1
+
+        key_calls = []
+        failure_key = server._failure_key
+        monkeypatch.setattr(
+            server, "_failure_key",
+            lambda *args: key_calls.append(args) or failure_key(*args)
+        )
+        monkeypatch.setattr(
+            time, "monotonic", lambda: now + TOOL_FAILURE_WINDOW_SECONDS + 1
+        )
+        for _ in range(3):
+            response = await call_tool("detect_churn_risk", {"account_id": "acc_001"})
+            assert json.loads(response[0].text)["account_id"] == "acc_001"
+
+        assert key_calls == []
+        assert len(fresh_tool_failures) == 0